@@ -0,0 +1,151 @@
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_KEY_PREFIX = "db:sticky"
+
+
+@dataclass
+class RoutingState:
+    use_primary: bool = False
+    wrote: bool = False
+
+
+# Routing of the request being handled, None outside of requests
+_routing_state = ContextVar("routing_state", default=None)
+
+
+def get_replicas():
+    return [
+        alias for alias in settings.DATABASES if alias.startswith("replica")
+    ]
+
+
+def get_client_key(request):
+    """
+    User id of the bearer token or the session key. The token isn't
+    verified here, it only picks the database the reads go to.
+    """
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        try:
+            claims = jwt.decode(
+                header.removeprefix("Bearer "),
+                options={"verify_signature": False},
+            )
+        except jwt.PyJWTError:
+            return None
+        user_id = claims.get(jwt_settings.USER_ID_CLAIM)
+        return None if user_id is None else f"user:{user_id}"
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return session_key and f"session:{session_key}"
+
+
+def read_from_primary():
+    """
+    Send the remaining reads of the request to the primary. Results cached
+    or tagged under a version must be, as versions are bumped when the
+    primary commits and a lagging replica would store old rows under the
+    new version.
+    """
+    state = _routing_state.get()
+    if state is not None:
+        state.use_primary = True
+
+
+def _sticky_key(client_key):
+    return f"{STICKY_KEY_PREFIX}:{client_key}"
+
+
+class ReplicaRouter:
+    """
+    Reads of safe requests go to a random replica, all other queries to
+    the primary. Transactions, requests changing data and clients that
+    wrote within REPLICA_STICKY_SECONDS read from the primary as well.
+    """
+
+    def __init__(self):
+        self.replicas = get_replicas()
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if (
+            state is None
+            or state.use_primary
+            or not self.replicas
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        client_key = get_client_key(request)
+        state = RoutingState(
+            use_primary=request.method not in SAFE_METHODS
+            or bool(client_key and cache.get(_sticky_key(client_key)))
+        )
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        if state.wrote and client_key:
+            cache.set(
+                _sticky_key(client_key), 1, settings.REPLICA_STICKY_SECONDS
+            )
+        return response
+
+    async def __acall__(self, request):
+        client_key = get_client_key(request)
+        state = RoutingState(
+            use_primary=request.method not in SAFE_METHODS
+            or bool(client_key and await cache.aget(_sticky_key(client_key)))
+        )
+        token = _routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+        if state.wrote and client_key:
+            await cache.aset(
+                _sticky_key(client_key), 1, settings.REPLICA_STICKY_SECONDS
+            )
+        return response
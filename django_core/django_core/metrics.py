@@ -0,0 +1,204 @@
+import ipaddress
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUESTS = Counter(
+    "http_requests",
+    "Handled requests",
+    ["route", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency", ["route", "method"]
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "DB queries per request",
+    ["route", "method"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in DB queries per request",
+    ["route", "method"],
+)
+SERIALIZER_TIME = Histogram(
+    "http_request_serializer_duration_seconds",
+    "Time spent in serializers per request",
+    ["route", "method"],
+)
+DB_CONNECTIONS = Counter(
+    "db_connections_opened",
+    "New database connections, compare with http_requests for the reuse",
+    ["alias"],
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_time: float = 0.0
+    serializer_time: float = 0.0
+
+
+# Stats of the request being handled, shared with sync_to_async threads
+_request_stats = ContextVar("request_stats", default=None)
+# Nesting level of timed serializers, only the outermost one is measured
+_serializer_depth = ContextVar("serializer_depth", default=0)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def count_connection(connection, **kwargs):
+    DB_CONNECTIONS.labels(alias=connection.alias).inc()
+
+
+@contextmanager
+def track_serializer_time():
+    stats = _request_stats.get()
+    depth = _serializer_depth.get()
+    if stats is None or depth:
+        yield
+        return
+
+    token = _serializer_depth.set(depth + 1)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_time += time.perf_counter() - started
+        _serializer_depth.reset(token)
+
+
+class SerializerMetricsMixin:
+    """
+    Adds the time spent on validation and representation to the metrics
+    of the current request
+    """
+
+    def run_validation(self, *args, **kwargs):
+        with track_serializer_time():
+            return super().run_validation(*args, **kwargs)
+
+    def to_representation(self, *args, **kwargs):
+        with track_serializer_time():
+            return super().to_representation(*args, **kwargs)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        connection_created.connect(install_query_recorder)
+        connection_created.connect(count_connection)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.observe(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.observe(request, response, stats, started)
+        return response
+
+    def observe(self, request, response, stats, started):
+        resolver_match = request.resolver_match
+        if resolver_match is None:
+            route = "unmatched"
+        elif resolver_match.func is metrics_view:
+            return
+        else:
+            route = resolver_match.route
+
+        labels = {"route": route, "method": request.method}
+        REQUESTS.labels(status=response.status_code, **labels).inc()
+        REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - started)
+        DB_QUERIES.labels(**labels).observe(stats.queries)
+        DB_TIME.labels(**labels).observe(stats.db_time)
+        SERIALIZER_TIME.labels(**labels).observe(stats.serializer_time)
+
+
+def is_metrics_client(request):
+    address = ipaddress.ip_address(request.META["REMOTE_ADDR"])
+    return any(
+        address in ipaddress.ip_network(network)
+        for network in settings.METRICS_ALLOWED_NETWORKS
+    )
+
+
+def metrics_view(request):
+    if not is_metrics_client(request):
+        return HttpResponseForbidden()
+
+    # Every gunicorn worker writes its values to PROMETHEUS_MULTIPROC_DIR,
+    # the collector sums them up across workers
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,331 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor_value(value):
+    # Unlike DjangoJSONEncoder, keeps microseconds of datetimes
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination over a stable ordering without COUNT and OFFSET queries.
+
+    The cursor holds the ordering values of the last (or first) row of the
+    current page, the next page is fetched with a row comparison against
+    them. Views set the ordering with `keyset_ordering`, which must end
+    with a unique field, e.g. ("start_date", "id").
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    ordering = ("id",)
+    cursor_query_param = "cursor"
+    cursor_query_description = "The pagination cursor value."
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        self.request = request
+        self.ordering = getattr(view, "keyset_ordering", self.ordering)
+        self.cursor_values, self.reverse = self.decode_cursor(request)
+
+        if isinstance(queryset, list):
+            return self.get_page_rows(queryset)
+        if self.cursor_values is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(self.cursor_values, self.reverse)
+            )
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self.reverse_field(field) for field in ordering]
+        return queryset.order_by(*ordering)[: self.page_size + 1]
+
+    def get_page_rows(self, rows):
+        """
+        get_page_queryset for a list of model instances that is already
+        sorted by the keyset ordering, e.g. served from memory
+        """
+        if self.reverse:
+            rows = rows[::-1]
+        if self.cursor_values is not None and rows:
+            values = [
+                rows[0]._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, self.cursor_values)
+            ]
+            rows = [row for row in rows if self.follows(row, values)]
+        return rows[: self.page_size + 1]
+
+    def follows(self, row, values):
+        """
+        Python counterpart of get_keyset_filter
+        """
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != self.reverse
+            current = self.get_row_value(row, name)
+            if current != value:
+                return current < value if descending else current > value
+        return False
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = True if self.reverse else has_more
+        self.has_previous = (
+            has_more if self.reverse else self.cursor_values is not None
+        )
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        # Links are built from the boundary rows, an empty page has none
+        if not rows:
+            self.has_next = self.has_previous = False
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.cursor_query_description,
+                "schema": {"type": "string"},
+            }
+        ]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_row, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first_row, reverse=True)
+
+    def get_keyset_filter(self, values, reverse):
+        keyset_filter = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            lookup = f"{name}__lt" if descending else f"{name}__gt"
+            keyset_filter |= equal & Q(**{lookup: value})
+            equal &= Q(**{name: value})
+        return keyset_filter
+
+    def encode_cursor(self, row, reverse):
+        values = [
+            self.get_row_value(row, field.lstrip("-"))
+            for field in self.ordering
+        ]
+        cursor = urlsafe_b64encode(
+            json.dumps(
+                {"v": values, "r": reverse}, default=encode_cursor_value
+            ).encode()
+        ).decode()
+        url = remove_query_param(
+            self.request.build_absolute_uri(),
+            PageNumberPagination.page_query_param,
+        )
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()))
+            values, reverse = cursor["v"], bool(cursor["r"])
+        except (BinasciiError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    @staticmethod
+    def get_row_value(row, field):
+        if isinstance(row, dict):
+            return row[field]
+        return getattr(row, field)
+
+    @staticmethod
+    def reverse_field(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+
+class HybridPagination(BasePagination):
+    """
+    Page number pagination with a total count, or keyset pagination
+    when a cursor is passed or requested with ?pagination=cursor.
+    The default mode is set with DEFAULT_PAGINATION_MODE.
+    """
+
+    mode_query_param = "pagination"
+    modes = ("page", "cursor")
+
+    def __init__(self):
+        self.page_number = PageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.paginator = self.page_number
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.select_paginator(queryset, request, view)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # Lists are paginated in memory, without queries
+        if isinstance(queryset, list):
+            return self.paginate_queryset(queryset, request, view)
+        queryset = self.select_paginator(queryset, request, view)
+        if self.paginator is self.keyset:
+            return await self.keyset.apaginate_queryset(
+                queryset, request, view
+            )
+
+        # Same as PageNumberPagination.paginate_queryset, with the count
+        # and the page rows fetched asynchronously
+        page_number = self.page_number
+        page_number.request = request
+        paginator = page_number.django_paginator_class(
+            queryset, page_number.page_size
+        )
+        paginator.count = await queryset.acount()
+        try:
+            page_number.page = paginator.page(
+                page_number.get_page_number(request, paginator)
+            )
+        except InvalidPage:
+            raise NotFound(page_number.invalid_page_message)
+        page_number.page.object_list = [
+            row async for row in page_number.page.object_list
+        ]
+        return page_number.page.object_list
+
+    def select_paginator(self, queryset, request, view):
+        self.paginator = self.page_number
+        if self.use_keyset(request):
+            self.paginator = self.keyset
+        elif hasattr(queryset, "ordered") and not queryset.ordered:
+            queryset = queryset.order_by(
+                *getattr(view, "keyset_ordering", KeysetPagination.ordering)
+            )
+        return queryset
+
+    def use_keyset(self, request):
+        if request.query_params.get(self.keyset.cursor_query_param):
+            return True
+        mode = request.query_params.get(self.mode_query_param)
+        if mode not in self.modes:
+            mode = settings.DEFAULT_PAGINATION_MODE
+        return mode == "cursor"
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = self.page_number.get_paginated_response_schema(
+            schema
+        )
+        # Keyset pages are returned without the total count
+        response_schema["required"] = ["results"]
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pagination mode: page numbers with a total "
+                "count or keyset cursors.",
+                "schema": {"type": "string", "enum": list(self.modes)},
+            },
+            *self.page_number.get_schema_operation_parameters(view),
+            *self.keyset.get_schema_operation_parameters(view),
+        ]
+
+
+def estimate_count(queryset):
+    """
+    Number of rows of the queryset estimated by the PostgreSQL planner
+    from table statistics, None on other databases
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator of the admin changelists of large tables. Counts above
+    exact_count_threshold come from planner statistics instead of COUNT(*),
+    so the number of pages is approximate there.
+    """
+
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
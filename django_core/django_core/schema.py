@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+import json
+import re
+import threading
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from drf_spectacular.views import SpectacularAPIView
+
+GZIP_RE = re.compile(r"\bgzip\b")
+
+
+class StoredSchemaView(SpectacularAPIView):
+    """
+    Serves the schema stored in OPENAPI_SCHEMA_FILE by the spectacular
+    command instead of introspecting the views on every request. Without
+    the file, the schema is generated on every request under DEBUG and
+    once per worker otherwise.
+
+    Every format is rendered and compressed once per worker and answered
+    with an ETag, so polling clients get 304 responses.
+    """
+
+    _lock = threading.Lock()
+    _schema = None
+    # Renderer class -> (body, gzipped body, ETag)
+    _rendered = {}
+
+    def _get_schema_response(self, request):
+        path = Path(settings.OPENAPI_SCHEMA_FILE)
+        # Follows code changes during development
+        if settings.DEBUG and not path.exists():
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        content, compressed, etag = self.get_rendered(
+            renderer, partial(self.load_schema, request, path)
+        )
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type += f"; charset={renderer.charset}"
+            if GZIP_RE.search(request.headers.get("Accept-Encoding", "")):
+                response = HttpResponse(compressed, content_type=content_type)
+                response.headers["Content-Encoding"] = "gzip"
+            else:
+                response = HttpResponse(content, content_type=content_type)
+            response.headers["Content-Disposition"] = (
+                f'inline; filename="{self._get_filename(request, None)}"'
+            )
+        response.headers["ETag"] = etag
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    def load_schema(self, request, path):
+        """
+        The stored schema, generated from the views if the file is missing
+        """
+        if path.exists():
+            return json.loads(path.read_bytes())
+        generator = self.generator_class(
+            urlconf=self.urlconf,
+            api_version=self.api_version,
+            patterns=self.patterns,
+        )
+        return generator.get_schema(request=request, public=self.serve_public)
+
+    @classmethod
+    def get_rendered(cls, renderer, load_schema):
+        with cls._lock:
+            if cls._schema is None:
+                cls._schema = load_schema()
+            key = type(renderer)
+            if key not in cls._rendered:
+                content = renderer.render(
+                    cls._schema, renderer.media_type, renderer_context={}
+                )
+                # Weak, as the compressed body is the same representation
+                etag = f'W/"{hashlib.sha256(content).hexdigest()[:32]}"'
+                cls._rendered[key] = (
+                    content,
+                    gzip.compress(content, mtime=0),
+                    etag,
+                )
+            return cls._rendered[key]
@@ -1,11 +1,12 @@
 from django.conf import settings
-from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from django_core.metrics import metrics_view
+from django_core.schema import StoredSchemaView
+from drf_spectacular.views import SpectacularSwaggerView
 
 api_urlpatterns = [
     path("auth/", include("users.urls")),
-    path("docs/", SpectacularAPIView.as_view(), name="schema"),
+    path("docs/", StoredSchemaView.as_view(), name="schema"),
     path(
         "docs/swagger/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -15,13 +16,25 @@ api_urlpatterns = [
         "rooms/",
         include("rooms.urls"),
     ),
+    # Async read paths, served without blocking a worker under ASGI
+    path(
+        "async/rooms/",
+        include("rooms.async_urls"),
+    ),
 ]
 
 internal_urlpatterns = [
-    path("admin/", admin.site.urls),
     path(settings.API_PREFIX, include(api_urlpatterns)),
 ]
 
+if not settings.API_ONLY:
+    from django.contrib import admin
+
+    internal_urlpatterns.append(path("admin/", admin.site.urls))
+
+if settings.METRICS_ENABLED:
+    internal_urlpatterns.append(path("metrics", metrics_view))
+
 urlpatterns = [
     path(settings.BASE_URL, include(internal_urlpatterns)),
 ]
@@ -0,0 +1,23 @@
+import os
+import shutil
+
+# Workers write their metrics to files there, /metrics sums them up.
+# Processes started otherwise don't have the variable and keep their
+# metrics in memory. Set before prometheus_client is imported, as it
+# picks the mode on import.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus")
+
+
+def on_starting(server):
+    # Drop the metric files left by workers of the previous run
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
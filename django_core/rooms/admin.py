@@ -1,5 +1,45 @@
+from datetime import datetime
+
 from django.contrib import admin
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from django_core.pagination import EstimatedCountPaginator
+from rooms.managers import ReservationQuerySet
 from rooms.models import Reservation, Room
+from users.models import User
+
+
+class DateHierarchyQuerySet(ReservationQuerySet):
+    """
+    Lists the years, months or days of the date hierarchy between the
+    first and the last value instead of a DISTINCT over every row. Periods
+    without reservations in between are listed as well.
+    """
+
+    def datetimes(self, field_name, kind, order="ASC", tzinfo=None):
+        bounds = self.aggregate(first=Min(field_name), last=Max(field_name))
+        if bounds["first"] is None:
+            return []
+        first = timezone.localtime(bounds["first"])
+        last = timezone.localtime(bounds["last"])
+        if kind == "year":
+            periods = [
+                (year, 1, 1) for year in range(first.year, last.year + 1)
+            ]
+        elif kind == "month":
+            periods = [
+                (month // 12, month % 12 + 1, 1)
+                for month in range(
+                    first.year * 12 + first.month - 1,
+                    last.year * 12 + last.month,
+                )
+            ]
+        else:
+            periods = [
+                (first.year, first.month, day)
+                for day in range(first.day, last.day + 1)
+            ]
+        return [timezone.make_aware(datetime(*period)) for period in periods]
 
 
 @admin.register(Room)
@@ -12,4 +52,33 @@ class RoomAdmin(admin.ModelAdmin):
 @admin.register(Reservation)
 class ReservationAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "room", "start_date", "end_date")
-    search_fields = ("user", "room")
+    list_select_related = ("user", "room")
+    search_fields = ("user__email", "room__name")
+    search_help_text = "Guest email or room name"
+    autocomplete_fields = ("user", "room")
+    date_hierarchy = "start_date"
+    ordering = ("-start_date", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return DateHierarchyQuerySet(
+            model=self.model, query=queryset.query, using=queryset.db
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        # Guests and rooms are matched in subqueries that use their trigram
+        # indexes, the OR over joined tables can't use an index
+        users = User.objects.filter(email__icontains=search_term)
+        rooms = Room.objects.filter(name__icontains=search_term)
+        return (
+            queryset.filter(
+                Q(user_id__in=users.values("id"))
+                | Q(room_id__in=rooms.values("id"))
+            ),
+            False,
+        )
@@ -0,0 +1,11 @@
+from django.urls import path
+from rooms.async_views import available_rooms, reservations
+
+urlpatterns = [
+    path(
+        "rooms/available/",
+        available_rooms,
+        name="async-available-rooms",
+    ),
+    path("reservations/", reservations, name="async-reservations"),
+]
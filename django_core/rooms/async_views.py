@@ -0,0 +1,129 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from django_filters.utils import translate_validation
+from django_core.db_routers import read_from_primary
+from django_core.pagination import HybridPagination
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+)
+from rest_framework.request import Request
+from rooms.availability import availability_index
+from rooms.cache import get_available_rooms_cache_key
+from rooms.catalog import room_catalog
+from rooms.filters import RoomFilter
+from rooms.models import Reservation, Room
+from rooms.serializers import (
+    ReservationValuesSerializer,
+    RoomRetrieveSerializer,
+)
+from rooms.utils import parse_datetime_param
+from rooms.views import ReservationViewSet, RoomViewSet
+from users.authentication import aauthenticate, has_admin_role
+
+
+def error_response(error):
+    # Same payload as the DRF exception handler
+    data = error.detail
+    if not isinstance(data, (dict, list)):
+        data = {"detail": data}
+    return JsonResponse(data, status=error.status_code, safe=False)
+
+
+async def get_available_rooms_data(request):
+    start_date = parse_datetime_param(request.query_params.get("start_date"))
+    end_date = parse_datetime_param(request.query_params.get("end_date"))
+
+    if not start_date or not end_date or start_date >= end_date:
+        busy_room_ids = None
+        queryset = Room.objects.none()
+    elif settings.AVAILABILITY_INDEX_ENABLED:
+        busy_room_ids = await sync_to_async(availability_index.busy_room_ids)(
+            start_date, end_date
+        )
+        queryset = Room.objects.exclude(id__in=busy_room_ids)
+    else:
+        busy_room_ids = Reservation.objects.overlapping(
+            start_date, end_date
+        ).values_list("room_id", flat=True)
+        queryset = Room.objects.exclude(id__in=busy_room_ids)
+
+    filterset = RoomFilter(request.query_params, queryset=queryset)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+
+    rooms = filterset.qs
+    if settings.ROOM_CATALOG_ENABLED and busy_room_ids is not None:
+        if not isinstance(busy_room_ids, list):
+            busy_room_ids = [room_id async for room_id in busy_room_ids]
+        rooms = await sync_to_async(room_catalog.select)(
+            busy_room_ids, **filterset.form.cleaned_data
+        )
+
+    pagination = HybridPagination()
+    page = await pagination.apaginate_queryset(rooms, request, RoomViewSet)
+    return pagination.get_paginated_response(
+        RoomRetrieveSerializer(page, many=True).data
+    ).data
+
+
+@require_GET
+async def available_rooms(request):
+    """
+    Async version of RoomViewSet.list
+    """
+    request = Request(request)
+    cache_key = None
+    if settings.USE_ENDPOINT_CACHE:
+        read_from_primary()
+        cache_key = get_available_rooms_cache_key(request)
+        data = await cache.aget(cache_key)
+        if data is not None:
+            return JsonResponse(data)
+
+    try:
+        data = await get_available_rooms_data(request)
+    except APIException as error:
+        return error_response(error)
+
+    if cache_key:
+        await cache.aset(cache_key, data, settings.ENDPOINT_CACHE_TIMEOUT)
+    return JsonResponse(data)
+
+
+@require_GET
+async def reservations(request):
+    """
+    Async version of ReservationViewSet.list
+    """
+    request = Request(request)
+    try:
+        user = await aauthenticate(request)
+        if user is None:
+            raise NotAuthenticated()
+
+        queryset = Reservation.objects.values(
+            *ReservationValuesSerializer.values_fields
+        )
+        if not (user.is_admin and await sync_to_async(has_admin_role)(user)):
+            queryset = queryset.filter(user_id=user.id)
+
+        pagination = HybridPagination()
+        page = await pagination.apaginate_queryset(
+            queryset, request, ReservationViewSet
+        )
+    except APIException as error:
+        response = error_response(error)
+        if error.status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = 'Bearer realm="api"'
+        return response
+
+    return JsonResponse(
+        pagination.get_paginated_response(
+            ReservationValuesSerializer(page).data
+        ).data
+    )
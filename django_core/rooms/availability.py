@@ -0,0 +1,251 @@
+import bisect
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rooms.models import Reservation
+from rooms.versions import bump_version, get_version
+
+AVAILABILITY_VERSION = "rooms:availability"
+# Every version bumped by a reservation write has a change record, which
+# other workers apply instead of reloading the index
+CHANGE_KEY_PREFIX = "rooms:availability:change"
+CHANGE_TIMEOUT = 60 * 60
+# Workers further behind reload the index
+MAX_CHANGES_BEHIND = 1000
+
+
+def _change_key(version):
+    return f"{CHANGE_KEY_PREFIX}:{version}"
+
+
+def first_free_window(intervals, start, duration, latest_start):
+    """
+    Start of the earliest gap of at least duration that begins between
+    start and latest_start, found in one pass over intervals sorted by
+    their start. None if there is no such gap.
+    """
+    for interval_start, interval_end in intervals:
+        if interval_start - start >= duration:
+            break
+        start = max(start, interval_end)
+        if start > latest_start:
+            return None
+    return start if start <= latest_start else None
+
+
+class RoomIntervals:
+    """
+    Reservations of a single room kept sorted by start date
+    """
+
+    __slots__ = ("starts", "ends", "ids", "max_ends")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        # Running maximum of end dates, so overlap checks stay correct
+        # even if intervals of the same room overlap each other.
+        self.max_ends = []
+
+    def __bool__(self):
+        return bool(self.ids)
+
+    def add(self, reservation_id, start, end):
+        index = bisect.bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+        self.ids.insert(index, reservation_id)
+        self._update_max_ends(index)
+
+    def remove(self, reservation_id):
+        index = self.ids.index(reservation_id)
+        del self.starts[index]
+        del self.ends[index]
+        del self.ids[index]
+        self._update_max_ends(index)
+
+    def overlaps(self, start, end):
+        index = bisect.bisect_left(self.starts, end)
+        return index > 0 and self.max_ends[index - 1] > start
+
+    def free_window(self, start, duration, latest_start):
+        index = bisect.bisect_right(self.starts, start)
+        # Intervals starting earlier may still cover start
+        if index:
+            start = max(start, self.max_ends[index - 1])
+        return first_free_window(
+            (
+                (self.starts[position], self.ends[position])
+                for position in range(index, len(self.starts))
+            ),
+            start,
+            duration,
+            latest_start,
+        )
+
+    def _update_max_ends(self, index):
+        del self.max_ends[index:]
+        current = self.max_ends[-1] if self.max_ends else None
+        for end in self.ends[index:]:
+            if current is None or end > current:
+                current = end
+            self.max_ends.append(current)
+
+
+class AvailabilityIndex:
+    """
+    Per-worker index of reservation intervals grouped by room.
+
+    The index follows the shared version counter. Every reservation write
+    bumps it and publishes a change record for the new version, so
+    workers catch up by applying the records they missed. The index is
+    reloaded from the database without the lock only when records are
+    missing, e.g. after bulk writes, or it fell too far behind.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rooms = {}
+        self._room_by_reservation = {}
+        self._version = None
+
+    def busy_room_ids(self, start_date, end_date):
+        start, end = start_date.timestamp(), end_date.timestamp()
+        self._ensure_fresh()
+        with self._lock:
+            return [
+                room_id
+                for room_id, intervals in self._rooms.items()
+                if intervals.overlaps(start, end)
+            ]
+
+    def free_windows(self, room_ids, start_date, duration, latest_start):
+        """
+        Room id -> start of the earliest free window, see first_free_window
+        """
+        start = start_date.timestamp()
+        seconds = duration.total_seconds()
+        latest = latest_start.timestamp()
+        self._ensure_fresh()
+        with self._lock:
+            starts = {
+                room_id: (
+                    self._rooms[room_id].free_window(start, seconds, latest)
+                    if room_id in self._rooms
+                    else start
+                )
+                for room_id in room_ids
+            }
+        return {
+            room_id: (
+                None
+                if start is None
+                else datetime.fromtimestamp(start, timezone.utc)
+            )
+            for room_id, start in starts.items()
+        }
+
+    def reservation_saved(self, reservation_id, room_id, start_date, end_date):
+        self._publish(
+            (
+                "saved",
+                reservation_id,
+                room_id,
+                start_date.timestamp(),
+                end_date.timestamp(),
+            )
+        )
+
+    def reservation_deleted(self, reservation_id):
+        self._publish(("deleted", reservation_id))
+
+    def _publish(self, change):
+        version = bump_version(AVAILABILITY_VERSION)
+        cache.set(_change_key(version), change, CHANGE_TIMEOUT)
+        with self._lock:
+            # Otherwise other writes came first, the next lookup applies
+            # their records and this one
+            if self._version == version - 1:
+                self._apply(change)
+                self._version = version
+
+    def _apply(self, change):
+        kind, reservation_id, *period = change
+        self._discard(reservation_id)
+        if kind == "saved":
+            room_id, start, end = period
+            self._rooms.setdefault(room_id, RoomIntervals()).add(
+                reservation_id, start, end
+            )
+            self._room_by_reservation[reservation_id] = room_id
+
+    def _discard(self, reservation_id):
+        room_id = self._room_by_reservation.pop(reservation_id, None)
+        if room_id is None:
+            return
+        intervals = self._rooms[room_id]
+        intervals.remove(reservation_id)
+        if not intervals:
+            del self._rooms[room_id]
+
+    def _ensure_fresh(self):
+        # The version is read before loading, so a write committed while
+        # loading makes the next lookup catch up again instead of being
+        # lost.
+        version = get_version(AVAILABILITY_VERSION)
+        with self._lock:
+            if self._version == version or self._catch_up(version):
+                return
+        # Lookups of other threads keep using the current index meanwhile
+        rooms, room_by_reservation = self._read()
+        with self._lock:
+            if self._version is None or self._version < version:
+                self._rooms = rooms
+                self._room_by_reservation = room_by_reservation
+                self._version = version
+
+    def _catch_up(self, version):
+        """
+        Apply the change records up to the version, False if some are
+        missing
+        """
+        if self._version is None:
+            return False
+        behind = version - self._version
+        if not 0 < behind <= MAX_CHANGES_BEHIND:
+            return False
+        keys = [
+            _change_key(self._version + offset)
+            for offset in range(1, behind + 1)
+        ]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys):
+            return False
+        for key in keys:
+            self._apply(changes[key])
+        self._version = version
+        return True
+
+    def _read(self):
+        rooms = defaultdict(RoomIntervals)
+        room_by_reservation = {}
+        # A lagging replica would leave the index stale until the next write
+        reservations = (
+            Reservation.objects.using(DEFAULT_DB_ALIAS)
+            .order_by("room_id", "start_date")
+            .values_list("id", "room_id", "start_date", "end_date")
+            .iterator(chunk_size=5000)
+        )
+        for reservation_id, room_id, start_date, end_date in reservations:
+            rooms[room_id].add(
+                reservation_id, start_date.timestamp(), end_date.timestamp()
+            )
+            room_by_reservation[reservation_id] = room_id
+        return dict(rooms), room_by_reservation
+
+
+availability_index = AvailabilityIndex()
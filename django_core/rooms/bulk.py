@@ -0,0 +1,163 @@
+import operator
+from collections import defaultdict
+from functools import reduce
+
+from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from rest_framework import serializers
+from rooms.managers import overlapping_q
+from rooms.models import Reservation, Room, reservation_constraint_message
+from rooms.partitioning import lock_rooms
+from rooms.serializers import (
+    ReservationBulkItemSerializer,
+    ReservationRetrieveSerializer,
+)
+
+OVERLAP_ERROR = "Room is already reserved for the given dates."
+BATCH_OVERLAP_ERROR = "Reservation overlaps another reservation in the batch."
+BATCH_REJECTED_ERROR = "Not created as other reservations were rejected."
+
+
+def _overlaps(period, periods):
+    start_date, end_date = period
+    return any(
+        start_date < other_end and end_date > other_start
+        for other_start, other_end in periods
+    )
+
+
+def _reject_reserved(periods, errors, using):
+    """
+    Reject the periods overlapping stored reservations, with a single query
+    """
+    if not periods:
+        return
+
+    reserved = defaultdict(list)
+    overlapping = (
+        Reservation.objects.using(using)
+        .filter(
+            reduce(
+                operator.or_,
+                (
+                    overlapping_q(data["start_date"], data["end_date"])
+                    & Q(room_id=data["room"])
+                    for data in periods.values()
+                ),
+            )
+        )
+        .values_list("room_id", "start_date", "end_date")
+    )
+    for room_id, start_date, end_date in overlapping:
+        reserved[room_id].append((start_date, end_date))
+
+    for index, data in list(periods.items()):
+        period = (data["start_date"], data["end_date"])
+        if _overlaps(period, reserved[data["room"]]):
+            errors[index] = {"non_field_errors": [OVERLAP_ERROR]}
+            del periods[index]
+
+
+def create_reservations(user, items, all_or_nothing=False):
+    """
+    Validate a batch of reservations against each other and against stored
+    reservations with a single query, then insert the valid ones with
+    bulk_create. Returns per-item results in the order of the items.
+    """
+    errors = {}
+    periods = {}
+    for index, item in enumerate(items):
+        serializer = ReservationBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            periods[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+
+    rooms = Room.objects.in_bulk({data["room"] for data in periods.values()})
+    accepted = defaultdict(list)
+    for index, data in list(periods.items()):
+        period = (data["start_date"], data["end_date"])
+        if data["room"] not in rooms:
+            errors[index] = {
+                "room": [
+                    f'Invalid pk "{data["room"]}" - object does not exist.'
+                ]
+            }
+        # Earlier items of the batch win over later ones
+        elif _overlaps(period, accepted[data["room"]]):
+            errors[index] = {"non_field_errors": [BATCH_OVERLAP_ERROR]}
+        else:
+            accepted[data["room"]].append(period)
+            continue
+        del periods[index]
+
+    using = router.db_for_write(Reservation)
+    reservations = {}
+    try:
+        with transaction.atomic(using=using):
+            if periods and settings.RESERVATION_PARTITIONING:
+                # Exclusion constraints only cover single partitions
+                lock_rooms([data["room"] for data in periods.values()], using)
+            _reject_reserved(periods, errors, using)
+
+            if all_or_nothing and errors:
+                periods = {}
+
+            reservations = {
+                index: Reservation(
+                    room=rooms[data["room"]],
+                    user_id=user.id,
+                    start_date=data["start_date"],
+                    end_date=data["end_date"],
+                )
+                for index, data in periods.items()
+            }
+            if reservations:
+                Reservation.objects.using(using).bulk_create(
+                    reservations.values()
+                )
+                # bulk_create skips model signals, receivers keeping
+                # derived state in sync rely on them
+                for reservation in reservations.values():
+                    post_save.send(
+                        sender=Reservation,
+                        instance=reservation,
+                        created=True,
+                        raw=False,
+                        using=using,
+                        update_fields=None,
+                    )
+    except IntegrityError as error:
+        message = reservation_constraint_message(error)
+        if message is None:
+            raise
+        raise serializers.ValidationError(message)
+
+    created = dict(
+        zip(
+            reservations,
+            ReservationRetrieveSerializer(
+                reservations.values(), many=True
+            ).data,
+        )
+    )
+    return [
+        (
+            {
+                "index": index,
+                "status": "created",
+                "reservation": created[index],
+            }
+            if index in created
+            else {
+                "index": index,
+                "status": "rejected",
+                "errors": errors.get(
+                    index, {"non_field_errors": [BATCH_REJECTED_ERROR]}
+                ),
+            }
+        )
+        for index in range(len(items))
+    ]
@@ -0,0 +1,97 @@
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rooms.filters import RoomFilter
+from rooms.utils import parse_datetime_param
+from rooms.versions import get_version
+from users.authentication import has_admin_role
+
+AVAILABLE_ROOMS_VERSION = "rooms:available-rooms"
+# Bumped by every reservation write, per user by writes of the user
+RESERVATIONS_VERSION = "rooms:reservations"
+# Bumped by changes of every user's reservation list: rooms shown in the
+# lists, updated reservations and writes bypassing the model signals
+RESERVATION_LISTS_VERSION = "rooms:reservation-lists"
+
+CACHED_QUERY_PARAMS = (
+    *RoomFilter.base_filters,
+    "page",
+    "cursor",
+    "pagination",
+    "format",
+)
+
+
+def get_available_rooms_cache_key(request):
+    """
+    Cache key of the available rooms response, built from the normalized
+    date window, filter and pagination parameters and the current version
+    """
+    params = {
+        name: request.query_params.getlist(name)
+        for name in CACHED_QUERY_PARAMS
+        if name in request.query_params
+    }
+    for name in ("start_date", "end_date"):
+        value = parse_datetime_param(request.query_params.get(name))
+        params[name] = value.timestamp() if value else None
+
+    digest = hashlib.sha256(
+        json.dumps(
+            [request.get_host(), request.path, params], sort_keys=True
+        ).encode()
+    ).hexdigest()
+    version = get_version(AVAILABLE_ROOMS_VERSION)
+    return f"rooms:available:{version}:{digest}"
+
+
+def user_reservations_version(user_id):
+    return f"{RESERVATIONS_VERSION}:user:{user_id}"
+
+
+def make_etag(*parts):
+    digest = hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+    return quote_etag(digest[:32])
+
+
+def get_available_rooms_etag(request):
+    return make_etag(
+        get_available_rooms_cache_key(request),
+        request.accepted_renderer.format,
+    )
+
+
+def get_reservations_etag(request):
+    """
+    ETag of the reservation list of the user, changes with the versions of
+    the reservations the user sees
+    """
+    user = request.user
+    if has_admin_role(user):
+        scope, version = "all", RESERVATIONS_VERSION
+    else:
+        scope, version = user.id, user_reservations_version(user.id)
+    return make_etag(
+        request.get_host(),
+        request.get_full_path(),
+        request.accepted_renderer.format,
+        scope,
+        get_version(version),
+        get_version(RESERVATION_LISTS_VERSION),
+    )
+
+
+def conditional_response(request, etag, get_response):
+    """
+    304 Not Modified if the client has the representation with the ETag,
+    otherwise the response of get_response. The ETag must be computed
+    before the data, so a write committed in between leaves it behind the
+    data and not ahead of it.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = get_response()
+    response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,92 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rooms.models import Reservation
+from rooms.occupancy import occupied_days
+
+
+def get_day_boundaries(date_from, date_to):
+    """
+    Local midnights surrounding every day from date_from to date_to inclusive
+    """
+    days = (date_to - date_from).days + 1
+    return [
+        timezone.make_aware(
+            datetime.combine(date_from + timedelta(days=day), time.min)
+        )
+        for day in range(days + 1)
+    ]
+
+
+def build_occupancy_grid(room_ids, date_from, date_to):
+    """
+    build_busy_grid answered with equality lookups on the occupancy table
+    """
+    # Imported on first use, NumPy takes a noticeable part of start-up
+    import numpy as np
+
+    busy = np.zeros(
+        (len(room_ids), (date_to - date_from).days + 1), dtype=bool
+    )
+    positions = {room_id: row for row, room_id in enumerate(room_ids)}
+    for room_id, day in occupied_days(room_ids, date_from, date_to):
+        busy[positions[room_id], (day - date_from).days] = True
+    return busy
+
+
+def build_busy_grid(room_ids, date_from, date_to):
+    """
+    Boolean grid of shape (rooms, days), True where the room is reserved
+    for at least part of the day. Reservations of all rooms are fetched
+    with a single query and projected onto the days at once.
+    """
+    import numpy as np
+
+    midnights = get_day_boundaries(date_from, date_to)
+    boundaries = np.array([midnight.timestamp() for midnight in midnights])
+    days = len(boundaries) - 1
+    changes = np.zeros((len(room_ids), days + 1), dtype=np.int32)
+
+    reservations = list(
+        Reservation.objects.overlapping(midnights[0], midnights[-1])
+        .filter(room_id__in=room_ids)
+        .values_list("room_id", "start_date", "end_date")
+    )
+    if reservations:
+        positions = {room_id: row for row, room_id in enumerate(room_ids)}
+        rows = np.array([positions[room_id] for room_id, _, _ in reservations])
+        starts = np.array([start.timestamp() for _, start, _ in reservations])
+        ends = np.array([end.timestamp() for _, _, end in reservations])
+
+        first_days = np.clip(
+            np.searchsorted(boundaries, starts, side="right") - 1, 0, days
+        )
+        last_days = np.clip(
+            np.searchsorted(boundaries, ends, side="left"), 0, days
+        )
+        np.add.at(changes, (rows, first_days), 1)
+        np.add.at(changes, (rows, last_days), -1)
+
+    return np.cumsum(changes[:, :days], axis=1) > 0
+
+
+def build_calendars(room_ids, date_from, date_to):
+    if settings.OCCUPANCY_LOOKUPS_ENABLED:
+        busy = build_occupancy_grid(room_ids, date_from, date_to)
+    else:
+        busy = build_busy_grid(room_ids, date_from, date_to)
+    dates = [
+        (date_from + timedelta(days=day)).isoformat()
+        for day in range(busy.shape[1])
+    ]
+    return [
+        {
+            "room": room_id,
+            "days": [
+                {"date": date, "is_free": not is_busy}
+                for date, is_busy in zip(dates, busy_days.tolist())
+            ],
+        }
+        for room_id, busy_days in zip(room_ids, busy)
+    ]
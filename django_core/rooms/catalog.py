@@ -0,0 +1,122 @@
+import threading
+from decimal import ROUND_CEILING, ROUND_FLOOR
+
+from django.db import DEFAULT_DB_ALIAS
+from rooms.models import Room
+from rooms.versions import bump_version, get_version
+
+ROOM_CATALOG_VERSION = "rooms:catalog"
+
+
+def to_cents(price, rounding):
+    return int((price * 100).to_integral_value(rounding))
+
+
+class RoomCatalog:
+    """
+    Per-worker columnar snapshot of the rooms, sorted by price and id.
+
+    Price and capacity filters are evaluated with vector operations over
+    the columns instead of a query. Like the availability index, the
+    snapshot is reloaded when the shared version counter differs from the
+    one it was built for and writes of this worker are applied in place.
+    NumPy is only imported once the catalog is used.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rooms = []
+        self._version = None
+
+    def select(
+        self,
+        busy_room_ids=(),
+        min_price=None,
+        max_price=None,
+        min_capacity=None,
+        max_capacity=None,
+    ):
+        """
+        Rooms matching the filters and not in busy_room_ids, ordered by
+        price and id
+        """
+        import numpy as np
+
+        with self._lock:
+            self._ensure_fresh()
+            ids, prices, capacities = self._ids, self._prices, self._capacities
+            mask = ~np.isin(ids, np.fromiter(busy_room_ids, dtype=np.int64))
+            if min_price is not None:
+                mask &= prices >= to_cents(min_price, ROUND_CEILING)
+            if max_price is not None:
+                mask &= prices <= to_cents(max_price, ROUND_FLOOR)
+            if min_capacity is not None:
+                mask &= capacities >= min_capacity
+            if max_capacity is not None:
+                mask &= capacities <= max_capacity
+            return [self._rooms[position] for position in np.flatnonzero(mask)]
+
+    def room_saved(self, room_id, name, price_per_day, capacity):
+        # The instance may still hold the price as it was assigned
+        price_per_day = Room._meta.get_field("price_per_day").to_python(
+            price_per_day
+        )
+        room = Room(
+            id=room_id,
+            name=name,
+            price_per_day=price_per_day,
+            capacity=capacity,
+        )
+        self._apply(
+            lambda: self._set_columns(
+                [other for other in self._rooms if other.id != room_id]
+                + [room]
+            )
+        )
+
+    def room_deleted(self, room_id):
+        self._apply(
+            lambda: self._set_columns(
+                [room for room in self._rooms if room.id != room_id]
+            )
+        )
+
+    def _apply(self, change):
+        with self._lock:
+            expected = self._version
+            version = bump_version(ROOM_CATALOG_VERSION)
+            # Any other version means another worker has written in the
+            # meantime, the snapshot is then reloaded on the next lookup.
+            if expected is not None and version == expected + 1:
+                change()
+                self._version = version
+
+    def _set_columns(self, rooms):
+        import numpy as np
+
+        rooms = sorted(rooms, key=lambda room: (room.price_per_day, room.id))
+        self._rooms = rooms
+        self._ids = np.array([room.id for room in rooms], dtype=np.int64)
+        self._prices = np.array(
+            [to_cents(room.price_per_day, ROUND_FLOOR) for room in rooms],
+            dtype=np.int64,
+        )
+        self._capacities = np.array(
+            [room.capacity for room in rooms], dtype=np.int32
+        )
+
+    def _ensure_fresh(self):
+        # The version is read before loading, so a write committed while
+        # loading makes the next lookup reload again instead of being lost.
+        version = get_version(ROOM_CATALOG_VERSION)
+        if version != self._version:
+            # Read from the primary, as for the availability index
+            self._set_columns(
+                Room.objects.using(DEFAULT_DB_ALIAS).only(
+                    "id", "name", "price_per_day", "capacity"
+                )
+            )
+            self._version = version
+
+
+room_catalog = RoomCatalog()
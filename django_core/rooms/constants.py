@@ -1 +1,27 @@
 NAME_MAX_LENGTH = 50
+
+RESERVATION_OVERLAP_CONSTRAINT = "reservation_room_overlap_excl"
+
+# Longest allowed stay, a business rule enforced by the serializers and
+# the reservation_max_duration constraint. Overlap queries rely on it to
+# bound the start_date of overlapping reservations from below, so range
+# scans and partitions stay narrow: raising it needs no data change, but
+# lowering it requires shortening the longer existing stays first.
+RESERVATION_MAX_DAYS = 90
+RESERVATION_MAX_DURATION_CONSTRAINT = "reservation_max_duration"
+
+CALENDAR_MAX_DAYS = 366
+
+# How far ahead free windows are looked for
+FREE_WINDOW_MAX_HORIZON_DAYS = 366
+
+RESERVATION_BULK_MAX_SIZE = 500
+
+# Rows fetched per round trip of the server-side cursor of exports
+RESERVATION_EXPORT_CHUNK_SIZE = 2000
+
+# Bounds of the group search, they bound its runtime as well
+GROUP_SEARCH_MAX_GUESTS = 100
+GROUP_SEARCH_MAX_RESULTS = 20
+
+OCCUPANCY_REBUILD_BATCH_SIZE = 5000
@@ -0,0 +1,95 @@
+import csv
+import json
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.utils import timezone
+from rooms.constants import RESERVATION_EXPORT_CHUNK_SIZE, RESERVATION_MAX_DAYS
+
+EXPORT_FIELDS = (
+    "id",
+    "start_date",
+    "end_date",
+    "room_id",
+    "room__name",
+    "room__price_per_day",
+    "user_id",
+    "user__email",
+)
+EXPORT_COLUMNS = tuple(field.replace("__", "_") for field in EXPORT_FIELDS)
+
+
+class Echo:
+    """
+    File-like object handing written lines back instead of buffering them
+    """
+
+    def write(self, value):
+        return value
+
+
+def filter_export(queryset, start_date=None, end_date=None, room_ids=None):
+    """
+    Reservations overlapping the period, either bound may be omitted
+    """
+    if start_date:
+        # Bounded from below as in overlapping_q, for partition pruning
+        queryset = queryset.filter(
+            start_date__gt=start_date - timedelta(days=RESERVATION_MAX_DAYS),
+            end_date__gt=start_date,
+        )
+    if end_date:
+        queryset = queryset.filter(start_date__lt=end_date)
+    if room_ids:
+        queryset = queryset.filter(room_id__in=room_ids)
+    return queryset
+
+
+def export_rows(queryset):
+    """
+    Flat rows of the reservations, read with a server-side cursor
+    """
+    for row in (
+        queryset.order_by("start_date", "id")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=RESERVATION_EXPORT_CHUNK_SIZE)
+    ):
+        yield [
+            (
+                timezone.localtime(value).isoformat()
+                if isinstance(value, datetime)
+                else value
+            )
+            for value in row
+        ]
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        # Prices are the only Decimal values, kept exact as strings
+        yield json.dumps(
+            dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False, default=str
+        ) + "\n"
+
+
+def join_lines(lines, size=RESERVATION_EXPORT_CHUNK_SIZE):
+    """
+    Send lines in chunks rather than one write per row
+    """
+    lines = iter(lines)
+    while chunk := "".join(islice(lines, size)):
+        yield chunk
+
+
+# Format -> line generator and content type
+EXPORT_FORMATS = {
+    "csv": (csv_lines, "text/csv; charset=utf-8"),
+    "ndjson": (ndjson_lines, "application/x-ndjson"),
+}
@@ -0,0 +1,93 @@
+import heapq
+from collections import defaultdict
+from itertools import groupby
+
+
+def prune_rooms(rooms, guests):
+    """
+    Rooms that can be part of the cheapest groups. Rooms of the same
+    capacity and price are interchangeable and a minimal group takes at
+    most guests / capacity rooms of a capacity, so only that many rooms
+    of every such type are needed.
+    """
+    by_type = defaultdict(list)
+    for room in rooms:
+        if room.capacity:
+            by_type[room.capacity, room.price_per_day].append(room)
+
+    pruned = []
+    for (capacity, _), candidates in by_type.items():
+        pruned.extend(
+            heapq.nsmallest(
+                -(-guests // capacity), candidates, key=lambda room: room.id
+            )
+        )
+    return pruned
+
+
+def cheapest_groups(rooms, guests, limit):
+    """
+    Up to limit groups of rooms seating at least guests at the lowest
+    total price per day, as (total price, rooms) pairs, cheapest first.
+
+    Rooms of the same capacity and price are interchangeable, so the
+    search runs over such room types. It is a k-best dynamic program over
+    the number of seated guests capped at guests. Types are added by
+    descending capacity and a group is complete once it seats everybody,
+    so every group is minimal: removing any of its rooms leaves guests
+    without a seat.
+    """
+    rooms = sorted(
+        prune_rooms(rooms, guests),
+        key=lambda room: (-room.capacity, room.price_per_day, room.id),
+    )
+    types = [
+        list(same_type)
+        for _, same_type in groupby(
+            rooms, key=lambda room: (room.capacity, room.price_per_day)
+        )
+    ]
+
+    # Seated guests -> up to limit cheapest (price in cents, path) pairs,
+    # paths link back as (type position, rooms of the type, previous path)
+    states = {0: [(0, ())]}
+    for position, same_type in enumerate(types):
+        capacity = same_type[0].capacity
+        price = int(same_type[0].price_per_day * 100)
+        updated = defaultdict(
+            list, {seated: list(groups) for seated, groups in states.items()}
+        )
+        # Prices are positive, partial groups costing as much as the
+        # limit-th complete group can't make it into the result
+        complete = states.get(guests, [])
+        bound = complete[-1][0] if len(complete) == limit else None
+        for seated, groups in states.items():
+            if seated >= guests:
+                continue
+            if bound is not None:
+                groups = [group for group in groups if group[0] < bound]
+            count = 0
+            # All rooms but the last one leave somebody without a seat
+            while (
+                count < len(same_type) and seated + count * capacity < guests
+            ):
+                count += 1
+                target = min(guests, seated + count * capacity)
+                updated[target].extend(
+                    (total + count * price, (position, count, path))
+                    for total, path in groups
+                )
+        states = {
+            seated: heapq.nsmallest(limit, groups)
+            for seated, groups in updated.items()
+        }
+
+    results = []
+    for _, path in states.get(guests, []):
+        segments = []
+        while path:
+            position, count, path = path
+            segments.append(types[position][:count])
+        group = [room for segment in reversed(segments) for room in segment]
+        results.append((sum(room.price_per_day for room in group), group))
+    return results
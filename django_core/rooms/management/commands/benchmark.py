@@ -0,0 +1,353 @@
+import json
+import random
+import secrets
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.utils import timezone
+from rooms.management.commands.loadtest import percentiles
+from rooms.models import Reservation, Room
+from users.models import User
+
+BENCHMARK_USERS = {
+    User.Role.CUSTOMER: "benchmark-customer@example.com",
+    User.Role.ADMIN: "benchmark-admin@example.com",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Call the rooms, reservations and auth endpoints in-process against "
+        "the configured database and report p50/p95/p99 latency and "
+        "queries and new connections per request. With --baseline, fail "
+        "when a scenario got slower or runs more queries than in a "
+        "previous --json report"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            default=[],
+            help="Only run scenarios whose name starts with the value",
+        )
+        parser.add_argument("--json", help="Write the report to the path")
+        parser.add_argument("--baseline", help="Report to compare against")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.25,
+            help="Allowed relative p95 slowdown against the baseline",
+        )
+        parser.add_argument(
+            "--min-regression-ms",
+            type=float,
+            default=2.0,
+            help="Slowdowns below this many milliseconds are noise",
+        )
+        parser.add_argument("--random-seed", type=int, default=0)
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            help="Override CONN_MAX_AGE of all databases, 0 connects anew "
+            "for every request",
+        )
+
+    def handle(self, *args, **options):
+        if not Room.objects.exists():
+            raise CommandError("No rooms found, run seed_data first")
+
+        self.rng = random.Random(options["random_seed"])
+        if options["conn_max_age"] is not None:
+            for alias in connections:
+                connections[alias].close()
+                connections[alias].settings_dict["CONN_MAX_AGE"] = options[
+                    "conn_max_age"
+                ]
+        self.connects = 0
+        connection_created.connect(self.count_connection)
+        self.prefix = f"/{settings.BASE_URL}{settings.API_PREFIX}"
+        self.client = Client()
+        self.password = secrets.token_urlsafe()
+        self.users = {
+            role: self.get_user(email, role)
+            for role, email in BENCHMARK_USERS.items()
+        }
+        self.tokens = {
+            role: self.login(user.email) for role, user in self.users.items()
+        }
+        self.room_ids = list(
+            Room.objects.order_by("?").values_list("id", flat=True)[:100]
+        )
+
+        scenarios = {
+            name: scenario
+            for name, scenario in self.get_scenarios().items()
+            if not options["scenario"]
+            or name.startswith(tuple(options["scenario"]))
+        }
+        try:
+            results = {
+                name: self.run(
+                    name, *scenario, options["iterations"], options["warmup"]
+                )
+                for name, scenario in scenarios.items()
+            }
+        finally:
+            Reservation.objects.filter(
+                user=self.users[User.Role.CUSTOMER]
+            ).delete()
+
+        report = {
+            "database": connection.vendor,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "iterations": options["iterations"],
+            "results": results,
+        }
+        if options["json"]:
+            with open(options["json"], "w") as file:
+                json.dump(report, file, indent=2)
+        if options["baseline"]:
+            self.compare(results, options)
+
+    def count_connection(self, **kwargs):
+        self.connects += 1
+
+    def get_user(self, email, role):
+        user = User.objects.filter(email=email).first()
+        if user is None:
+            user = User.objects.create_user(email, role=role)
+        user.set_password(self.password)
+        user.save(update_fields=["password"])
+        return user
+
+    def login(self, email):
+        response = self.client.post(
+            f"{self.prefix}auth/login",
+            {"email": email, "password": self.password},
+            content_type="application/json",
+        )
+        if response.status_code != 200:
+            raise CommandError(f"Login failed: {response.content!r}")
+        return response.json()["access"]
+
+    def random_period(self, min_days=1, max_days=60):
+        start_date = timezone.now().replace(
+            minute=0, second=0, microsecond=0
+        ) + timedelta(days=self.rng.randint(min_days, max_days))
+        return start_date, start_date + timedelta(days=self.rng.randint(1, 7))
+
+    def get_scenarios(self):
+        """
+        Name -> (method, path, role, data factory, expected statuses)
+        """
+
+        def available_rooms(**params):
+            def data():
+                start_date, end_date = self.random_period()
+                return {
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                    **params,
+                }
+
+            return data
+
+        def calendar():
+            date_from = timezone.localdate() + timedelta(
+                days=self.rng.randint(0, 30)
+            )
+            return {
+                "from": date_from.isoformat(),
+                "to": (date_from + timedelta(days=30)).isoformat(),
+            }
+
+        def reservation():
+            # Far in the future, so conflicts come from the benchmark only
+            start_date, end_date = self.random_period(3650, 7300)
+            return {
+                "room": self.rng.choice(self.room_ids),
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            }
+
+        customer, admin = User.Role.CUSTOMER, User.Role.ADMIN
+        return {
+            "auth login": (
+                "post",
+                "auth/login",
+                None,
+                lambda: {
+                    "email": self.users[customer].email,
+                    "password": self.password,
+                },
+                {200},
+            ),
+            "auth me": ("get", "auth/me/", customer, dict, {200}),
+            "rooms available": (
+                "get",
+                "rooms/rooms/available/",
+                None,
+                available_rooms(),
+                {200},
+            ),
+            "rooms available cursor": (
+                "get",
+                "rooms/rooms/available/",
+                None,
+                available_rooms(pagination="cursor"),
+                {200},
+            ),
+            "rooms available filtered": (
+                "get",
+                "rooms/rooms/available/",
+                None,
+                available_rooms(min_capacity=2, max_price=8000),
+                {200},
+            ),
+            "rooms calendar": (
+                "get",
+                "rooms/rooms/calendar/",
+                None,
+                calendar,
+                {200},
+            ),
+            "reservations create": (
+                "post",
+                "rooms/reservations/",
+                customer,
+                reservation,
+                {201, 400},
+            ),
+            "reservations list customer": (
+                "get",
+                "rooms/reservations/",
+                customer,
+                dict,
+                {200},
+            ),
+            "reservations list admin": (
+                "get",
+                "rooms/reservations/",
+                admin,
+                dict,
+                {200},
+            ),
+            "reservations list admin cursor": (
+                "get",
+                "rooms/reservations/",
+                admin,
+                lambda: {"pagination": "cursor"},
+                {200},
+            ),
+        }
+
+    def request(self, method, path, role, data):
+        headers = {}
+        if role:
+            headers["Authorization"] = f"Bearer {self.tokens[role]}"
+        # The test client leaves connections open, while the request
+        # handler closes expired and broken ones around every request
+        close_old_connections()
+        try:
+            if method == "get":
+                return self.client.get(
+                    f"{self.prefix}{path}", data, headers=headers
+                )
+            return getattr(self.client, method)(
+                f"{self.prefix}{path}",
+                data,
+                content_type="application/json",
+                headers=headers,
+            )
+        finally:
+            close_old_connections()
+
+    def run(
+        self, name, method, path, role, data, expected, iterations, warmup
+    ):
+        for _ in range(warmup):
+            self.request(method, path, role, data())
+
+        timings, queries, statuses = [], [], Counter()
+        connects = self.connects
+        for _ in range(iterations):
+            payload = data()
+            executed = []
+            # Unlike CaptureQueriesContext, doesn't open a connection ahead
+            # of the request
+            with connection.execute_wrapper(
+                lambda execute, *args: executed.append(args) or execute(*args)
+            ):
+                started = time.perf_counter()
+                response = self.request(method, path, role, payload)
+                timings.append(time.perf_counter() - started)
+            queries.append(len(executed))
+            statuses[response.status_code] += 1
+
+        p50, p95, p99 = percentiles(timings)
+        result = {
+            "p50": round(p50, 2),
+            "p95": round(p95, 2),
+            "p99": round(p99, 2),
+            "queries": round(sum(queries) / len(queries), 2),
+            "connections": round((self.connects - connects) / iterations, 2),
+            "errors": sum(
+                count
+                for status, count in statuses.items()
+                if status not in expected
+            ),
+        }
+        self.stdout.write(
+            f"{name}: p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms, "
+            f"{result['queries']:g} queries, "
+            f"{result['connections']:g} connections, "
+            f"statuses {dict(sorted(statuses.items()))}"
+        )
+        return result
+
+    def compare(self, results, options):
+        with open(options["baseline"]) as file:
+            baseline = json.load(file)["results"]
+
+        regressions = []
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]
+            allowed = max(
+                before["p95"] * (1 + options["max_regression"]),
+                before["p95"] + options["min_regression_ms"],
+            )
+            if result["p95"] > allowed:
+                regressions.append(
+                    f"{name}: p95 {before['p95']} -> {result['p95']} ms"
+                )
+            if result["queries"] > before["queries"]:
+                regressions.append(
+                    f"{name}: queries {before['queries']} -> "
+                    f"{result['queries']}"
+                )
+            if result["connections"] > before.get("connections", 0):
+                regressions.append(
+                    f"{name}: connections {before.get('connections', 0)} -> "
+                    f"{result['connections']}"
+                )
+            if result["errors"] > before["errors"]:
+                regressions.append(
+                    f"{name}: errors {before['errors']} -> {result['errors']}"
+                )
+
+        if regressions:
+            raise CommandError(
+                "Regressions against the baseline:\n" + "\n".join(regressions)
+            )
+        self.stdout.write("No regressions against the baseline")
@@ -0,0 +1,200 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter, prints the phase timings as JSON
+BOOT_SCRIPT = """
+import json
+import time
+
+started = time.perf_counter()
+
+import django
+from django.apps import AppConfig
+from django.conf import settings
+
+ready_times = {}
+create_app_config = AppConfig.create.__func__
+
+
+def create(cls, entry):
+    app_config = create_app_config(cls, entry)
+    ready = app_config.ready
+
+    def timed_ready():
+        ready_started = time.perf_counter()
+        ready()
+        ready_times[app_config.label] = time.perf_counter() - ready_started
+
+    app_config.ready = timed_ready
+    return app_config
+
+
+AppConfig.create = classmethod(create)
+
+settings.INSTALLED_APPS
+settings_loaded = time.perf_counter()
+django.setup()
+apps_loaded = time.perf_counter()
+
+from django.urls import get_resolver
+
+get_resolver().url_patterns
+urls_loaded = time.perf_counter()
+
+from django.core.handlers.wsgi import WSGIHandler
+
+WSGIHandler()
+middleware_loaded = time.perf_counter()
+
+print(json.dumps({
+    "phases": {
+        "settings": settings_loaded - started,
+        "apps": apps_loaded - settings_loaded - sum(ready_times.values()),
+        "ready": sum(ready_times.values()),
+        "urls": urls_loaded - apps_loaded,
+        "middleware": middleware_loaded - urls_loaded,
+        "total": middleware_loaded - started,
+    },
+    "ready": ready_times,
+}))
+"""
+
+
+def parse_import_times(output):
+    """
+    Self import time of every top-level package in seconds, from the
+    output of python -X importtime
+    """
+    packages = defaultdict(float)
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, name = line.removeprefix("import time:").split("|")
+        if not self_time.strip().isdigit():
+            continue
+        packages[name.strip().split(".")[0]] += int(self_time) / 1e6
+    return packages
+
+
+def median_ms(runs):
+    """
+    Median of every key over the runs, in milliseconds
+    """
+    keys = dict.fromkeys(key for run in runs for key in run)
+    return {
+        key: round(
+            statistics.median(run.get(key, 0) for run in runs) * 1000, 1
+        )
+        for key in keys
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the project in fresh interpreters and report the time spent "
+        "on settings, app loading, ready() of every app, URLconf and "
+        "middleware, and the import time of every package. With "
+        "--baseline, fail when start-up got slower than in a previous "
+        "--json report"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            help="DJANGO_PROFILE to start with, e.g. api",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--json", help="Write the report to the path")
+        parser.add_argument("--baseline", help="Report to compare against")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.25,
+            help="Allowed relative slowdown against the baseline",
+        )
+        parser.add_argument(
+            "--min-regression-ms",
+            type=float,
+            default=20.0,
+            help="Slowdowns below this many milliseconds are noise",
+        )
+
+    def handle(self, *args, **options):
+        environ = {**os.environ}
+        if options["profile"]:
+            environ["DJANGO_PROFILE"] = options["profile"]
+
+        runs = [self.boot(environ) for _ in range(options["repeat"])]
+        report = {
+            "profile": environ.get("DJANGO_PROFILE", settings.DJANGO_PROFILE),
+            "repeat": options["repeat"],
+            "phases": median_ms([run["phases"] for run in runs]),
+            "ready": median_ms([run["ready"] for run in runs]),
+            "packages": median_ms([run["packages"] for run in runs]),
+        }
+
+        self.stdout.write(
+            ", ".join(
+                f"{phase} {time:g} ms"
+                for phase, time in report["phases"].items()
+            )
+        )
+        self.stdout.write("ready():")
+        self.write_slowest(report["ready"], options["limit"])
+        self.stdout.write("Imports by package:")
+        self.write_slowest(report["packages"], options["limit"])
+
+        if options["json"]:
+            with open(options["json"], "w") as file:
+                json.dump(report, file, indent=2)
+        if options["baseline"]:
+            self.compare(report, options)
+
+    def boot(self, environ):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=environ,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(f"Start-up failed:\n{process.stderr}")
+        return {
+            **json.loads(process.stdout.splitlines()[-1]),
+            "packages": parse_import_times(process.stderr),
+        }
+
+    def write_slowest(self, times, limit):
+        slowest = sorted(times.items(), key=lambda item: -item[1])[:limit]
+        for name, time in slowest:
+            self.stdout.write(f"  {name}: {time:g} ms")
+
+    def compare(self, report, options):
+        with open(options["baseline"]) as file:
+            baseline = json.load(file)
+
+        regressions = []
+        for section in ("phases", "packages"):
+            for name, time in report[section].items():
+                before = baseline[section].get(name, 0)
+                allowed = max(
+                    before * (1 + options["max_regression"]),
+                    before + options["min_regression_ms"],
+                )
+                if time > allowed:
+                    regressions.append(f"{name}: {before} -> {time} ms")
+
+        if regressions:
+            raise CommandError(
+                "Regressions against the baseline:\n" + "\n".join(regressions)
+            )
+        self.stdout.write("No regressions against the baseline")
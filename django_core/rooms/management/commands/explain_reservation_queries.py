@@ -0,0 +1,183 @@
+import json
+import statistics
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rooms.models import Reservation, Room
+from rooms.signals import reservations_changed_in_bulk
+from users.models import User
+
+# A copy of the reservation table with the indexes it had before the
+# reservation indexes: the primary key, the foreign key indexes and the
+# overlap constraint. Temporary tables are looked up first, so the same
+# queries read the copy, and the table itself is never locked.
+BASELINE_COPY_SQL = (
+    "CREATE TEMP TABLE rooms_reservation ON COMMIT DROP AS "
+    "SELECT * FROM rooms_reservation",
+    "ALTER TABLE pg_temp.rooms_reservation ADD PRIMARY KEY (id)",
+    "CREATE INDEX ON pg_temp.rooms_reservation (room_id)",
+    "CREATE INDEX ON pg_temp.rooms_reservation (user_id)",
+)
+
+# Every reservation gets its own slot of SLOT_DAYS per room, so seeded
+# rows never violate the overlap constraint
+SLOT_DAYS = 4
+
+SEED_RESERVATIONS_SQL = """
+INSERT INTO rooms_reservation (room_id, user_id, start_date, end_date)
+SELECT
+    rooms.ids[1 + n %% rooms.total],
+    users.ids[1 + (n * 7919) %% users.total],
+    %(base)s + (n / rooms.total) * interval '{slot} days',
+    %(base)s + (n / rooms.total) * interval '{slot} days'
+        + (1 + n %% 3) * interval '1 day'
+FROM
+    generate_series(0::bigint, %(count)s - 1) AS n,
+    (SELECT array_agg(id) AS ids, count(*) AS total FROM rooms_room) rooms,
+    (SELECT array_agg(id) AS ids, count(*) AS total FROM users_user) users
+""".format(slot=SLOT_DAYS)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN ANALYZE for the reservation overlap and listing "
+        "queries, optionally seeding the database and comparing timings "
+        "with a temporary copy of the table without the reservation indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Number of reservations to insert before measuring",
+        )
+        parser.add_argument("--rooms", type=int, default=500)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Also measure on a copy of the table without the "
+            "reservation indexes",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self.seed(options["seed"], options["rooms"], options["users"])
+
+        queries = self.get_queries()
+        with_indexes = self.measure(queries, options["repeat"])
+        without_indexes = None
+        if options["compare"]:
+            with transaction.atomic():
+                self.create_baseline_copy()
+                without_indexes = self.measure(queries, options["repeat"])
+                transaction.set_rollback(True)
+
+        for name in queries:
+            time, indexes = with_indexes[name]
+            line = (
+                f"{name}: {time:.2f} ms ({', '.join(indexes) or 'seq scan'})"
+            )
+            if without_indexes:
+                time_before, indexes_before = without_indexes[name]
+                line += (
+                    f", without reservation indexes: {time_before:.2f} ms "
+                    f"({', '.join(indexes_before) or 'seq scan'})"
+                )
+            self.stdout.write(line)
+
+    def create_baseline_copy(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT pg_get_constraintdef(oid) FROM pg_constraint
+                WHERE conrelid = 'rooms_reservation'::regclass
+                    AND contype = 'x'
+                """)
+            exclusions = [definition for definition, in cursor.fetchall()]
+            for statement in BASELINE_COPY_SQL:
+                cursor.execute(statement)
+            for definition in exclusions:
+                cursor.execute(
+                    f"ALTER TABLE pg_temp.rooms_reservation ADD {definition}"
+                )
+            cursor.execute("ANALYZE pg_temp.rooms_reservation")
+
+    def seed(self, count, rooms, users):
+        if Reservation.objects.exists():
+            raise CommandError("--seed expects an empty reservation table")
+
+        if Room.objects.count() < rooms:
+            Room.objects.bulk_create(
+                Room(
+                    name=f"Room {number}",
+                    price_per_day=1000 + number % 50 * 100,
+                    capacity=1 + number % 6,
+                )
+                for number in range(rooms)
+            )
+        if User.objects.count() < users:
+            password = make_password(None)
+            User.objects.bulk_create(
+                (
+                    User(email=f"seed-{number}@example.com", password=password)
+                    for number in range(users)
+                ),
+                ignore_conflicts=True,
+            )
+
+        slots = count // Room.objects.count() + 1
+        # Most of the history lies in the past, the last tenth is upcoming
+        base = timezone.now() - timedelta(days=slots * SLOT_DAYS * 0.9)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                SEED_RESERVATIONS_SQL, {"base": base, "count": count}
+            )
+            cursor.execute("ANALYZE rooms_reservation")
+        reservations_changed_in_bulk()
+        self.stdout.write(f"Inserted {count} reservations")
+
+    def get_queries(self):
+        start_date = timezone.now() + timedelta(days=1)
+        end_date = start_date + timedelta(days=3)
+        room_id = Room.objects.values_list("id", flat=True).first()
+        user_id = Reservation.objects.values_list("user_id", flat=True).first()
+        return {
+            "available rooms": Room.objects.exclude(
+                id__in=Reservation.objects.overlapping(
+                    start_date, end_date
+                ).values_list("room_id", flat=True)
+            ),
+            "room overlap check": Reservation.objects.overlapping(
+                start_date, end_date
+            )
+            .filter(room_id=room_id)
+            .values("id")[:1],
+            "user reservations": Reservation.objects.filter(
+                user_id=user_id
+            ).order_by("start_date")[:10],
+        }
+
+    def measure(self, queries, repeat):
+        results = {}
+        for name, queryset in queries.items():
+            timings = []
+            indexes = set()
+            for _ in range(repeat):
+                plan = json.loads(
+                    queryset.explain(format="json", analyze=True)
+                )[0]
+                timings.append(plan["Execution Time"])
+                indexes |= self.get_plan_indexes(plan["Plan"])
+            results[name] = (statistics.median(timings), sorted(indexes))
+        return results
+
+    def get_plan_indexes(self, node):
+        indexes = {node["Index Name"]} if "Index Name" in node else set()
+        for child in node.get("Plans", []):
+            indexes |= self.get_plan_indexes(child)
+        return indexes
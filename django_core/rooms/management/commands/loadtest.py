@@ -0,0 +1,73 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+
+def percentiles(timings):
+    """
+    p50, p95 and p99 of the timings in milliseconds
+    """
+    if len(timings) < 2:
+        return (timings[0] * 1000,) * 3 if timings else (0.0,) * 3
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent GET requests to running servers and report "
+        "throughput and latency, e.g. to compare the WSGI and ASGI setups"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="+")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument(
+            "--header",
+            action="append",
+            default=[],
+            help='Request header, e.g. "Authorization: Bearer <token>"',
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        headers = dict(
+            (part.strip() for part in header.split(":", 1))
+            for header in options["header"]
+        )
+        for url in options["urls"]:
+            self.run(url, headers, options)
+
+    def run(self, url, headers, options):
+        local = threading.local()
+
+        def send(_):
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+                local.session.headers.update(headers)
+            started = time.perf_counter()
+            try:
+                response = local.session.get(url, timeout=options["timeout"])
+                failed = response.status_code >= 400
+            except requests.RequestException:
+                failed = True
+            return time.perf_counter() - started, failed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as executor:
+            results = list(executor.map(send, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+
+        timings = [timing for timing, _ in results]
+        errors = sum(failed for _, failed in results)
+        p50, p95, p99 = percentiles(timings)
+        self.stdout.write(
+            f"{url}\n"
+            f"  {len(results) / elapsed:.1f} req/s, {errors} errors, "
+            f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms"
+        )
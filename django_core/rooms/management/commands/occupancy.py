@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rooms.occupancy import find_inconsistencies, rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily room occupancy table from reservations or check "
+        "that it matches them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["rebuild", "check"])
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Inconsistent rows to show of each kind",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options["action"] == "rebuild":
+            count = rebuild_occupancy()
+            self.stdout.write(
+                f"Inserted {count} occupancy rows in "
+                f"{time.perf_counter() - started:.1f} s"
+            )
+            return
+
+        missing, extra = find_inconsistencies(options["limit"])
+        for title, rows in (("Missing", missing), ("Unexpected", extra)):
+            for room_id, day, reservation_id in rows:
+                self.stdout.write(
+                    f"{title}: room {room_id}, {day}, "
+                    f"reservation {reservation_id}"
+                )
+        if missing or extra:
+            raise CommandError(
+                "The occupancy table is inconsistent, "
+                "run manage.py occupancy rebuild"
+            )
+        self.stdout.write(
+            f"The occupancy table is consistent "
+            f"({time.perf_counter() - started:.1f} s)"
+        )
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rooms.partitioning import (
+    add_months,
+    convert_table,
+    create_partitions,
+    detach_partitions,
+    get_partitions,
+    is_partitioned,
+    month_start,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage monthly partitions of the reservation table: convert the "
+        "table to a partitioned one, create partitions ahead of time, "
+        "detach old partitions into archive tables or drop them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action", choices=["convert", "create", "archive", "status"]
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Months after the current one to create partitions for",
+        )
+        parser.add_argument(
+            "--before",
+            help="Archive partitions of the months before YYYY-MM",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop archived partitions instead of keeping them",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning requires PostgreSQL")
+
+        with connection.cursor() as cursor:
+            partitioned = is_partitioned(cursor)
+        if options["action"] == "convert":
+            if partitioned:
+                raise CommandError("The reservation table is partitioned")
+        elif not partitioned:
+            raise CommandError(
+                "The reservation table is not partitioned, run convert first"
+            )
+
+        if options["action"] == "status":
+            with connection.cursor() as cursor:
+                for name, bounds, rows in get_partitions(cursor):
+                    self.stdout.write(
+                        f"{name}: {bounds}, ~{max(rows, 0):.0f} rows"
+                    )
+            return
+
+        with connection.schema_editor() as schema_editor:
+            if options["action"] == "convert":
+                convert_table(schema_editor, options["months_ahead"])
+                self.stdout.write("Converted the reservation table")
+            elif options["action"] == "create":
+                now = timezone.now()
+                created = create_partitions(
+                    schema_editor,
+                    now,
+                    add_months(month_start(now), options["months_ahead"]),
+                )
+                self.stdout.write(f"Created {', '.join(created) or 'nothing'}")
+            else:
+                before = self.parse_month(options["before"])
+                detached = detach_partitions(
+                    schema_editor, before, options["drop"]
+                )
+                self.stdout.write(
+                    f"{'Dropped' if options['drop'] else 'Archived'} "
+                    f"{', '.join(detached) or 'nothing'}"
+                )
+
+        if not settings.RESERVATION_PARTITIONING:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Set RESERVATION_PARTITIONING=True so that reservations "
+                    "are checked for overlaps across partitions"
+                )
+            )
+
+    def parse_month(self, value):
+        if not value:
+            raise CommandError("archive requires --before YYYY-MM")
+        try:
+            return timezone.make_aware(datetime.strptime(value, "%Y-%m"))
+        except ValueError:
+            raise CommandError("--before must be YYYY-MM")
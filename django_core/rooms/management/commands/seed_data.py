@@ -0,0 +1,192 @@
+import random
+import secrets
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rooms.models import Reservation, Room
+from rooms.signals import (
+    reservations_changed_in_bulk,
+    rooms_changed_in_bulk,
+)
+from users.models import User
+
+ROOM_KINDS = {
+    "Standard": Decimal("2500"),
+    "Superior": Decimal("4000"),
+    "Deluxe": Decimal("6500"),
+    "Suite": Decimal("12000"),
+}
+
+CAPACITIES = (1, 2, 3, 4, 6)
+CAPACITY_WEIGHTS = (2, 6, 3, 2, 1)
+
+# Length of stay in nights and how often it occurs
+STAY_NIGHTS = (1, 2, 3, 4, 5, 7, 10, 14)
+STAY_WEIGHTS = (18, 22, 18, 12, 9, 11, 6, 4)
+
+CHECK_IN = timedelta(hours=14)
+CHECK_OUT = timedelta(hours=12)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate rooms, users and reservations at production-like volumes "
+        "with bulk inserts. Seeded rooms keep the requested share of their "
+        "nights booked and reservations never overlap"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=500)
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--reservations", type=int, default=100000)
+        parser.add_argument(
+            "--occupancy",
+            type=float,
+            default=0.7,
+            help="Share of nights a room is booked, between 0 and 1",
+        )
+        parser.add_argument(
+            "--future-share",
+            type=float,
+            default=0.2,
+            help="Share of the booked period that lies in the future",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of every seeded user",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--random-seed", type=int)
+
+    def handle(self, *args, **options):
+        if not 0 < options["occupancy"] <= 1:
+            raise CommandError("--occupancy must be in (0, 1]")
+        if not 0 <= options["future_share"] <= 1:
+            raise CommandError("--future-share must be in [0, 1]")
+
+        self.rng = random.Random(options["random_seed"])
+        self.batch_size = options["batch_size"]
+
+        room_ids = self.create_rooms(options["rooms"])
+        user_ids = self.create_users(options["users"], options["password"])
+        if options["reservations"]:
+            if not room_ids:
+                raise CommandError("Reservations need at least one room")
+            user_ids = user_ids or list(
+                User.objects.values_list("id", flat=True)
+            )
+            if not user_ids:
+                raise CommandError("Reservations need at least one user")
+            self.create_reservations(
+                options["reservations"],
+                room_ids,
+                user_ids,
+                options["occupancy"],
+                options["future_share"],
+            )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for model in (Room, User, Reservation):
+                    cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+        if room_ids:
+            rooms_changed_in_bulk()
+        reservations_changed_in_bulk()
+
+    def insert(self, model, objects):
+        """
+        Bulk insert the objects in batches and return the new ids
+        """
+        started = time.perf_counter()
+        ids = []
+        for batch in batched(objects, self.batch_size):
+            created = model.objects.bulk_create(batch)
+            ids.extend(obj.pk for obj in created)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Inserted {len(ids)} {model._meta.verbose_name_plural.lower()} "
+            f"in {elapsed:.1f} s ({len(ids) / max(elapsed, 1e-6):.0f} rows/s)"
+        )
+        return ids
+
+    def create_rooms(self, count):
+        def rooms():
+            for number in range(1, count + 1):
+                kind, base_price = self.rng.choice(list(ROOM_KINDS.items()))
+                capacity = self.rng.choices(CAPACITIES, CAPACITY_WEIGHTS)[0]
+                price = base_price * (1 + Decimal(capacity - 1) / 4)
+                yield Room(
+                    name=f"{kind} {number}",
+                    price_per_day=price.quantize(Decimal("100")),
+                    capacity=capacity,
+                )
+
+        return self.insert(Room, rooms())
+
+    def create_users(self, count, password):
+        # Hashing once keeps seeding fast, every user shares the password
+        password = make_password(password)
+        run = secrets.token_hex(3)
+
+        def users():
+            for number in range(1, count + 1):
+                yield User(
+                    email=f"guest-{run}-{number}@example.com",
+                    first_name=f"Guest {number}",
+                    password=password,
+                )
+
+        ids = self.insert(User, users())
+        if ids:
+            self.stdout.write(
+                f"Seeded users: guest-{run}-<1..{count}>@example.com"
+            )
+        return ids
+
+    def create_reservations(
+        self, count, room_ids, user_ids, occupancy, future_share
+    ):
+        per_room, extra = divmod(count, len(room_ids))
+        mean_nights = sum(
+            nights * weight
+            for nights, weight in zip(STAY_NIGHTS, STAY_WEIGHTS)
+        ) / sum(STAY_WEIGHTS)
+        mean_gap = mean_nights * (1 - occupancy) / occupancy
+        span = (per_room + 1) * mean_nights / occupancy
+        first_day = timezone.make_aware(
+            datetime.combine(timezone.localdate(), datetime.min.time())
+        ) - timedelta(days=round(span * (1 - future_share)))
+
+        def reservations():
+            for number, room_id in enumerate(room_ids):
+                day = self.rng.randrange(round(mean_gap) + 1)
+                for _ in range(per_room + (number < extra)):
+                    nights = self.rng.choices(STAY_NIGHTS, STAY_WEIGHTS)[0]
+                    # Check-out at noon comes before the next check-in, so
+                    # back to back stays in a room never overlap
+                    yield Reservation(
+                        room_id=room_id,
+                        user_id=self.rng.choice(user_ids),
+                        start_date=first_day + timedelta(days=day) + CHECK_IN,
+                        end_date=first_day
+                        + timedelta(days=day + nights)
+                        + CHECK_OUT,
+                    )
+                    day += nights
+                    if mean_gap:
+                        day += round(self.rng.expovariate(1 / mean_gap))
+
+        return self.insert(Reservation, reservations())
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.db import models
+from django.db.models import Q
+from rooms.constants import RESERVATION_MAX_DAYS
+
+
+def overlapping_q(start_date, end_date):
+    """
+    Reservations overlapping the period. The reservation_max_duration
+    constraint guarantees no reservation is longer than
+    RESERVATION_MAX_DAYS, so overlapping ones start after start_date minus
+    that, which lets the planner prune older partitions.
+    """
+    return Q(
+        start_date__lt=end_date,
+        start_date__gt=start_date - timedelta(days=RESERVATION_MAX_DAYS),
+        end_date__gt=start_date,
+    )
+
+
+class ReservationQuerySet(models.QuerySet):
+    def overlapping(self, start_date, end_date):
+        return self.filter(overlapping_q(start_date, end_date))
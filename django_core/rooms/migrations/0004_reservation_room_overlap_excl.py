@@ -0,0 +1,74 @@
+# Generated by Django 5.0.4 on 2026-10-18 11:52
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import rooms.models
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+
+def check_overlapping_reservations(apps, schema_editor):
+    """
+    Stop with the reservations of a room that overlap each other, which
+    the constraint rejects, so they can be moved or cancelled first
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT a.room_id, a.id, b.id
+            FROM rooms_reservation a
+            JOIN rooms_reservation b
+                ON b.room_id = a.room_id
+                AND b.id > a.id
+                AND b.start_date < a.end_date
+                AND b.end_date > a.start_date
+            ORDER BY a.room_id, a.id, b.id
+            LIMIT 20
+            """)
+        conflicts = cursor.fetchall()
+    if conflicts:
+        raise RuntimeError(
+            "Overlapping reservations of the same room, resolve them before "
+            "applying this migration (room: reservation ids): "
+            + ", ".join(
+                f"{room_id}: {first_id} and {second_id}"
+                for room_id, first_id, second_id in conflicts
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "rooms",
+            "0003_alter_reservation_options_alter_room_options_and_more",
+        ),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            check_overlapping_reservations, migrations.RunPython.noop
+        ),
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name="reservation",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=[
+                    (
+                        rooms.models.TsTzRange(
+                            "start_date",
+                            "end_date",
+                            django.contrib.postgres.fields.ranges.RangeBoundary(),  # noqa: E501
+                        ),
+                        "&&",
+                    ),
+                    ("room", "="),
+                ],
+                name="reservation_room_overlap_excl",
+                violation_error_message="Room is already reserved "
+                "for the given dates.",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.4 on 2026-10-18 11:53
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently to keep bookings writable
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0004_reservation_room_overlap_excl"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=models.Index(
+                fields=["room", "start_date", "end_date"],
+                name="reservation_room_period_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=models.Index(
+                fields=["end_date", "start_date"],
+                include=("room",),
+                name="reservation_period_room_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "start_date"],
+                name="reservation_user_start_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.4 on 2026-10-18 12:40
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0005_reservation_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="room",
+            index=models.Index(
+                fields=["price_per_day", "id"], name="room_price_id_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=models.Index(
+                fields=["start_date", "id"], name="reservation_start_id_idx"
+            ),
+        ),
+    ]
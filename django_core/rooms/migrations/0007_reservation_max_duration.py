@@ -0,0 +1,55 @@
+# Generated by Django 5.0.4 on 2026-10-18 12:24
+
+import datetime
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+def check_long_reservations(apps, schema_editor):
+    """
+    The constraint makes the 90-day limit a rule for every stay, so stop
+    with the stays that break it instead of failing on the first one
+    """
+    Reservation = apps.get_model("rooms", "Reservation")
+    long_reservations = Reservation.objects.filter(
+        end_date__gt=models.F("start_date") + datetime.timedelta(days=90)
+    ).values_list("id", flat=True)
+    ids = list(long_reservations[:20])
+    if ids:
+        raise RuntimeError(
+            f"{long_reservations.count()} reservations are longer than 90 "
+            f"days, e.g. {', '.join(map(str, ids))}. Shorten or split them "
+            "before applying this migration."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0006_keyset_pagination_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            check_long_reservations, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="reservation",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    (
+                        "end_date__lte",
+                        django.db.models.expressions.CombinedExpression(
+                            models.F("start_date"),
+                            "+",
+                            models.Value(datetime.timedelta(days=90)),
+                        ),
+                    )
+                ),
+                name="reservation_max_duration",
+                violation_error_message="Reservation must not exceed 90 days.",
+            ),
+        ),
+    ]
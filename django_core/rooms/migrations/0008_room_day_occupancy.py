@@ -0,0 +1,60 @@
+# Generated by Django 5.0.4 on 2026-10-18 12:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0007_reservation_max_duration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomDayOccupancy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                (
+                    "reservation",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occupancy",
+                        to="rooms.reservation",
+                        verbose_name="Reservation",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="rooms.room",
+                        verbose_name="Room",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Room day occupancy",
+                "verbose_name_plural": "Room day occupancy",
+                "indexes": [
+                    models.Index(
+                        fields=["room", "day"], name="occupancy_room_day_idx"
+                    ),
+                    models.Index(
+                        fields=["day", "room"], name="occupancy_day_room_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
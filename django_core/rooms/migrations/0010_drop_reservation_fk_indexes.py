@@ -0,0 +1,91 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+COLUMNS = ("room_id", "user_id")
+
+
+def fk_index_names(schema_editor):
+    """
+    Names Django gave the indexes of the foreign keys
+    """
+    return [
+        schema_editor._create_index_name(
+            "rooms_reservation", [column], suffix=""
+        )
+        for column in COLUMNS
+    ]
+
+
+def is_partitioned(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class "
+            "WHERE oid = 'rooms_reservation'::regclass"
+        )
+        return cursor.fetchone()[0] == "p"
+
+
+def drop_fk_indexes(apps, schema_editor):
+    # Indexes of partitioned tables can't be dropped concurrently
+    concurrently = "" if is_partitioned(schema_editor) else "CONCURRENTLY"
+    for name in fk_index_names(schema_editor):
+        schema_editor.execute(
+            f"DROP INDEX {concurrently} IF EXISTS "
+            f"{schema_editor.quote_name(name)}"
+        )
+
+
+def create_fk_indexes(apps, schema_editor):
+    concurrently = "" if is_partitioned(schema_editor) else "CONCURRENTLY"
+    for name, column in zip(fk_index_names(schema_editor), COLUMNS):
+        schema_editor.execute(
+            f"CREATE INDEX {concurrently} IF NOT EXISTS "
+            f"{schema_editor.quote_name(name)} "
+            f"ON rooms_reservation ({column})"
+        )
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are dropped concurrently to keep bookings writable. They
+    # are redundant with reservation_room_period_idx and
+    # reservation_user_start_idx, which lead with the same columns.
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0009_room_name_trgm_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="reservation",
+                    name="room",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="rooms.room",
+                        verbose_name="reserved room",
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="reservation",
+                    name="user",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Guest",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_fk_indexes, create_fk_indexes),
+            ],
+        ),
+    ]
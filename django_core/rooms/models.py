@@ -1,5 +1,21 @@
-from django.db import models
-from rooms.constants import NAME_MAX_LENGTH
+from datetime import timedelta
+
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import (
+    DateTimeRangeField,
+    RangeBoundary,
+    RangeOperators,
+)
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, router, transaction
+from django.db.models.functions import Cast, Upper
+from rooms.constants import (
+    NAME_MAX_LENGTH,
+    RESERVATION_MAX_DAYS,
+    RESERVATION_MAX_DURATION_CONSTRAINT,
+    RESERVATION_OVERLAP_CONSTRAINT,
+)
+from rooms.managers import ReservationQuerySet
 
 
 class Room(models.Model):
@@ -16,21 +32,151 @@ class Room(models.Model):
     class Meta:
         verbose_name = "Room"
         verbose_name_plural = "Rooms"
+        indexes = [
+            models.Index(
+                fields=["price_per_day", "id"], name="room_price_id_idx"
+            ),
+            # Matches the UPPER(name::text) LIKE '%...%' of icontains
+            GinIndex(
+                OpClass(
+                    Upper(Cast("name", models.TextField())),
+                    name="gin_trgm_ops",
+                ),
+                name="room_name_trgm_idx",
+            ),
+        ]
+
+
+class TsTzRange(models.Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
 
 
 class Reservation(models.Model):
+    # Looked up by the room and user indexes below, which lead with them
     room = models.ForeignKey(
         to="rooms.Room",
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name="reserved room",
     )
     user = models.ForeignKey(
-        to="users.User", on_delete=models.CASCADE, verbose_name="Guest"
+        to="users.User",
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Guest",
     )
     start_date = models.DateTimeField(verbose_name="Reservation start date")
     end_date = models.DateTimeField(verbose_name="Reservation end date")
-    objects = models.Manager()
+    objects = ReservationQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Reservation"
         verbose_name_plural = "Reservations"
+        constraints = [
+            ExclusionConstraint(
+                name=RESERVATION_OVERLAP_CONSTRAINT,
+                expressions=[
+                    (
+                        TsTzRange("start_date", "end_date", RangeBoundary()),
+                        RangeOperators.OVERLAPS,
+                    ),
+                    ("room", RangeOperators.EQUAL),
+                ],
+                violation_error_message=(
+                    "Room is already reserved for the given dates."
+                ),
+            ),
+            models.CheckConstraint(
+                check=models.Q(
+                    end_date__lte=models.F("start_date")
+                    + timedelta(days=RESERVATION_MAX_DAYS)
+                ),
+                name=RESERVATION_MAX_DURATION_CONSTRAINT,
+                violation_error_message=(
+                    f"Reservation must not exceed {RESERVATION_MAX_DAYS} days."
+                ),
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["room", "start_date", "end_date"],
+                name="reservation_room_period_idx",
+            ),
+            # Covers the availability anti-join without heap access,
+            # end_date leads as windows are mostly in the future
+            models.Index(
+                fields=["end_date", "start_date"],
+                include=["room"],
+                name="reservation_period_room_idx",
+            ),
+            models.Index(
+                fields=["user", "start_date"],
+                name="reservation_user_start_idx",
+            ),
+            models.Index(
+                fields=["start_date", "id"],
+                name="reservation_start_id_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The post_save receivers write the occupancy rows in the same
+        # transaction as the reservation
+        using = kwargs.get("using") or router.db_for_write(
+            type(self), instance=self
+        )
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+def reservation_constraint_message(error):
+    """
+    Violation message of the reservation constraint an IntegrityError was
+    raised by, None for other errors. Partitions name their copies of a
+    constraint with the partition suffix.
+    """
+    diag = getattr(error.__cause__, "diag", None)
+    name = getattr(diag, "constraint_name", None)
+    if not name:
+        return None
+    for constraint in Reservation._meta.constraints:
+        if name == constraint.name or name.startswith(f"{constraint.name}_"):
+            return constraint.violation_error_message
+    return None
+
+
+class RoomDayOccupancy(models.Model):
+    """
+    Local day of a room taken by a reservation for at least part of the
+    day, maintained from reservations by rooms.occupancy
+    """
+
+    room = models.ForeignKey(
+        to="rooms.Room",
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Room",
+    )
+    day = models.DateField(verbose_name="Day")
+    # The reservation id alone is not unique in a partitioned table, so
+    # there is no database foreign key
+    reservation = models.ForeignKey(
+        to="rooms.Reservation",
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="occupancy",
+        verbose_name="Reservation",
+    )
+
+    class Meta:
+        verbose_name = "Room day occupancy"
+        verbose_name_plural = "Room day occupancy"
+        indexes = [
+            models.Index(
+                fields=["room", "day"], name="occupancy_room_day_idx"
+            ),
+            models.Index(
+                fields=["day", "room"], name="occupancy_day_room_idx"
+            ),
+        ]
@@ -0,0 +1,180 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+from rooms.constants import OCCUPANCY_REBUILD_BATCH_SIZE
+from rooms.models import Reservation, RoomDayOccupancy
+
+# Rows every reservation should have: the local days its period overlaps
+EXPECTED_OCCUPANCY_SQL = """
+SELECT reservation.room_id, day::date AS day, reservation.id
+FROM {reservation} reservation, generate_series(
+    date_trunc('day', reservation.start_date AT TIME ZONE %(time_zone)s),
+    (reservation.end_date AT TIME ZONE %(time_zone)s)
+        - interval '1 microsecond',
+    interval '1 day'
+) AS day
+"""
+
+
+def reservation_days(start_date, end_date):
+    """
+    Local days overlapped by the period, the same days the calendar shows
+    as busy
+    """
+    first_day = timezone.localdate(start_date)
+    last_day = timezone.localdate(end_date - timedelta(microseconds=1))
+    return [
+        first_day + timedelta(days=day)
+        for day in range((last_day - first_day).days + 1)
+    ]
+
+
+def occupancy_rows(reservation):
+    return [
+        RoomDayOccupancy(
+            room_id=reservation.room_id, day=day, reservation_id=reservation.id
+        )
+        for day in reservation_days(
+            reservation.start_date, reservation.end_date
+        )
+    ]
+
+
+def reservation_saved(reservation, created, using=DEFAULT_DB_ALIAS):
+    """
+    Write the rows of a saved reservation, called in the saving transaction
+    """
+    with transaction.atomic(using=using):
+        if not created:
+            RoomDayOccupancy.objects.using(using).filter(
+                reservation_id=reservation.id
+            ).delete()
+        RoomDayOccupancy.objects.using(using).bulk_create(
+            occupancy_rows(reservation)
+        )
+
+
+def _expected_sql(connection):
+    return EXPECTED_OCCUPANCY_SQL.format(
+        reservation=connection.ops.quote_name(Reservation._meta.db_table)
+    )
+
+
+def rebuild_occupancy(using=DEFAULT_DB_ALIAS):
+    """
+    Recompute the whole occupancy table from reservations with a single
+    statement on PostgreSQL, in batches elsewhere, returns the number of
+    rows
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return _rebuild_occupancy_in_batches(using)
+    table = connection.ops.quote_name(RoomDayOccupancy._meta.db_table)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # Reservation writes maintain their rows in their own transaction,
+        # the lock waits for those in flight and holds new ones back until
+        # the table is rebuilt
+        cursor.execute(
+            "LOCK TABLE "
+            + connection.ops.quote_name(Reservation._meta.db_table)
+            + " IN SHARE MODE"
+        )
+        # TRUNCATE refuses tables with foreign key checks still deferred
+        # by the surrounding transaction
+        connection.check_constraints()
+        cursor.execute(f"TRUNCATE {table}")
+        cursor.execute(
+            f"INSERT INTO {table} (room_id, day, reservation_id) "
+            + _expected_sql(connection),
+            {"time_zone": settings.TIME_ZONE},
+        )
+        count = cursor.rowcount
+        cursor.execute(f"ANALYZE {table}")
+    return count
+
+
+def _rebuild_occupancy_in_batches(using):
+    count = 0
+    rows = []
+    with transaction.atomic(using=using):
+        RoomDayOccupancy.objects.using(using).all().delete()
+        reservations = (
+            Reservation.objects.using(using)
+            .only("room_id", "start_date", "end_date")
+            .iterator(chunk_size=OCCUPANCY_REBUILD_BATCH_SIZE)
+        )
+        for reservation in reservations:
+            rows.extend(occupancy_rows(reservation))
+            if len(rows) >= OCCUPANCY_REBUILD_BATCH_SIZE:
+                RoomDayOccupancy.objects.using(using).bulk_create(rows)
+                count += len(rows)
+                rows = []
+        RoomDayOccupancy.objects.using(using).bulk_create(rows)
+    return count + len(rows)
+
+
+def find_inconsistencies(limit=20, using=DEFAULT_DB_ALIAS):
+    """
+    Rows missing from the occupancy table and rows that should not be
+    there, as (room_id, day, reservation_id) tuples, at most limit each
+    """
+    connection = connections[using]
+    table = connection.ops.quote_name(RoomDayOccupancy._meta.db_table)
+    actual = f"SELECT room_id, day, reservation_id FROM {table}"
+    expected = _expected_sql(connection)
+    params = {"time_zone": settings.TIME_ZONE, "limit": limit}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"({expected}) EXCEPT ALL ({actual}) LIMIT %(limit)s", params
+        )
+        missing = cursor.fetchall()
+        cursor.execute(
+            f"({actual}) EXCEPT ALL ({expected}) LIMIT %(limit)s", params
+        )
+        extra = cursor.fetchall()
+    return missing, extra
+
+
+def occupied_days(room_ids, date_from, date_to):
+    """
+    (room_id, day) pairs taken between date_from and date_to inclusive
+    """
+    return (
+        RoomDayOccupancy.objects.filter(
+            room_id__in=room_ids, day__range=(date_from, date_to)
+        )
+        .values_list("room_id", "day")
+        .distinct()
+    )
+
+
+def occupancy_report(rooms, date_from, date_to):
+    """
+    Number and share of the rooms taken on every day from date_from to
+    date_to inclusive
+    """
+    total = rooms.count()
+    occupied = dict(
+        RoomDayOccupancy.objects.filter(
+            room__in=rooms, day__range=(date_from, date_to)
+        )
+        .values_list("day")
+        .annotate(rooms=Count("room_id", distinct=True))
+        .order_by()
+    )
+    report = []
+    for offset in range((date_to - date_from).days + 1):
+        day = date_from + timedelta(days=offset)
+        rooms_taken = occupied.get(day, 0)
+        report.append(
+            {
+                "date": day,
+                "occupied_rooms": rooms_taken,
+                "total_rooms": total,
+                "occupancy": round(rooms_taken / total, 4) if total else 0,
+            }
+        )
+    return report
@@ -0,0 +1,267 @@
+from datetime import datetime
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from rooms.constants import RESERVATION_OVERLAP_CONSTRAINT
+from rooms.models import Reservation, RoomDayOccupancy
+from rooms.signals import reservations_changed_in_bulk
+
+TABLE = Reservation._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def lock_rooms(room_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Serialize reservation writes per room until the end of the transaction.
+    Exclusion constraints of partitions do not see overlaps across
+    partition bounds, so writers check overlaps themselves under this lock.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(id) "
+            "FROM unnest(%s::bigint[]) AS id ORDER BY id",
+            [sorted(set(room_ids))],
+        )
+
+
+def month_start(value):
+    value = timezone.localtime(value)
+    return timezone.make_aware(datetime(value.year, value.month, 1))
+
+
+def add_months(value, months):
+    year, month = divmod(value.month - 1 + months, 12)
+    return timezone.make_aware(datetime(value.year + year, month + 1, 1))
+
+
+def parse_partition_name(name):
+    """
+    Start of the month of a monthly partition, None for other tables
+    """
+    try:
+        start = datetime.strptime(name, f"{TABLE}_p%Y_%m")
+    except ValueError:
+        return None
+    return timezone.make_aware(start)
+
+
+def partition_name(start):
+    return f"{TABLE}_p{start:%Y_%m}"
+
+
+def is_partitioned(cursor):
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE oid = %s::regclass", [TABLE]
+    )
+    return cursor.fetchone()[0] == "p"
+
+
+def get_partitions(cursor):
+    """
+    Name, bounds and row estimate of the partitions
+    """
+    cursor.execute(
+        """
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid),
+            child.reltuples
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = %s::regclass
+        ORDER BY child.relname
+        """,
+        [TABLE],
+    )
+    return cursor.fetchall()
+
+
+def overlap_constraint_sql(partition, schema_editor):
+    """
+    The reservation overlap constraint of the model, for one partition
+    """
+    constraint = next(
+        constraint
+        for constraint in Reservation._meta.constraints
+        if constraint.name == RESERVATION_OVERLAP_CONSTRAINT
+    ).clone()
+    suffix = partition.removeprefix(f"{TABLE}_")
+    constraint.name = f"{RESERVATION_OVERLAP_CONSTRAINT}_{suffix}"
+    return (
+        f"ALTER TABLE {schema_editor.quote_name(partition)} "
+        f"ADD {constraint.constraint_sql(Reservation, schema_editor)}"
+    )
+
+
+def create_partition(schema_editor, start):
+    """
+    Create and attach the partition of the month starting at start, moving
+    its rows out of the default partition. Returns False if it exists.
+    """
+    name = partition_name(start)
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0]:
+            return False
+
+        bounds = {"start": start, "end": add_months(start, 1)}
+        cursor.execute(
+            f"CREATE TABLE {quote(name)} (LIKE {quote(TABLE)} "
+            "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} "
+            "WHERE start_date >= %(start)s AND start_date < %(end)s "
+            f"RETURNING *) INSERT INTO {quote(name)} SELECT * FROM moved",
+            bounds,
+        )
+        # Matching indexes of the parent are built on attach
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(name)} "
+            "FOR VALUES FROM (%(start)s) TO (%(end)s)",
+            bounds,
+        )
+        cursor.execute(overlap_constraint_sql(name, schema_editor))
+    return True
+
+
+def create_partitions(schema_editor, first_month, last_month):
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if create_partition(schema_editor, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def convert_table(schema_editor, months_ahead):
+    """
+    Replace the reservation table with one partitioned by start_date
+    month, keeping rows, ids, indexes and foreign keys. Runs in the
+    transaction of the schema editor, the table is locked meanwhile.
+    """
+    quote = schema_editor.quote_name
+    legacy = f"{TABLE}_legacy"
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {quote(TABLE)} IN ACCESS EXCLUSIVE MODE")
+        # Constraints and indexes are recreated once the names are free
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            """,
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(indexrelid) FROM pg_index
+            WHERE indrelid = %s::regclass AND NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conindid = indexrelid
+            )
+            """,
+            [TABLE],
+        )
+        indexes = [definition for definition, in cursor.fetchall()]
+        cursor.execute(f"SELECT min(start_date), max(id) FROM {quote(TABLE)}")
+        first_start, last_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} RENAME TO {quote(legacy)}")
+        # Partitioned tables can't have identity columns before PostgreSQL
+        # 17, ids come from a plain sequence instead
+        cursor.execute(f"ALTER TABLE {quote(legacy)} ALTER id DROP IDENTITY")
+        cursor.execute(
+            f"CREATE TABLE {quote(TABLE)} (LIKE {quote(legacy)} "
+            "INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            "PARTITION BY RANGE (start_date)"
+        )
+        sequence = f"{TABLE}_id_seq"
+        cursor.execute(
+            f"CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(TABLE)}.id"
+        )
+        if last_id:
+            cursor.execute("SELECT setval(%s, %s)", [sequence, last_id])
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} ALTER id "
+            f"SET DEFAULT nextval('{sequence}')"
+        )
+        cursor.execute(
+            f"CREATE TABLE {quote(DEFAULT_PARTITION)} "
+            f"PARTITION OF {quote(TABLE)} DEFAULT"
+        )
+
+        now = timezone.now()
+        cursor.execute(
+            overlap_constraint_sql(DEFAULT_PARTITION, schema_editor)
+        )
+        create_partitions(
+            schema_editor,
+            first_start or now,
+            add_months(month_start(now), months_ahead),
+        )
+        cursor.execute(
+            f"INSERT INTO {quote(TABLE)} SELECT * FROM {quote(legacy)}"
+        )
+        cursor.execute(f"DROP TABLE {quote(legacy)}")
+
+        # The primary key has to include the partition key
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} ADD PRIMARY KEY (id, start_date)"
+        )
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {quote(TABLE)} "
+                f"ADD CONSTRAINT {quote(name)} {definition}"
+            )
+        for definition in indexes:
+            cursor.execute(definition.replace(legacy, TABLE))
+        cursor.execute(f"ANALYZE {quote(TABLE)}")
+
+
+def detach_partitions(schema_editor, before, drop=False):
+    """
+    Detach the monthly partitions ending before the given month. Detached
+    partitions are kept as archive tables without foreign keys, so rooms
+    and users can still be deleted, or dropped. Their occupancy rows are
+    deleted and the state derived from reservations is refreshed.
+    """
+    quote = schema_editor.quote_name
+    detached = []
+    with schema_editor.connection.cursor() as cursor:
+        for name, _, _ in get_partitions(cursor):
+            start = parse_partition_name(name)
+            if start is None or add_months(start, 1) > before:
+                continue
+
+            cursor.execute(
+                f"DELETE FROM {quote(RoomDayOccupancy._meta.db_table)} "
+                f"WHERE reservation_id IN (SELECT id FROM {quote(name)})"
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}"
+            )
+            if drop:
+                cursor.execute(f"DROP TABLE {quote(name)}")
+                detached.append(name)
+                continue
+
+            cursor.execute(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'f'",
+                [name],
+            )
+            for (constraint,) in cursor.fetchall():
+                cursor.execute(
+                    f"ALTER TABLE {quote(name)} "
+                    f"DROP CONSTRAINT {quote(constraint)}"
+                )
+            archive = name.replace(f"{TABLE}_p", f"{TABLE}_archive_")
+            cursor.execute(
+                f"ALTER TABLE {quote(name)} RENAME TO {quote(archive)}"
+            )
+            detached.append(archive)
+    if detached:
+        reservations_changed_in_bulk(
+            schema_editor.connection.alias, occupancy=False
+        )
+    return detached
@@ -1,14 +1,43 @@
+from datetime import timedelta
+
+from django_core.metrics import SerializerMetricsMixin, track_serializer_time
 from rest_framework import serializers
+from rooms.constants import (
+    FREE_WINDOW_MAX_HORIZON_DAYS,
+    GROUP_SEARCH_MAX_GUESTS,
+    GROUP_SEARCH_MAX_RESULTS,
+    RESERVATION_BULK_MAX_SIZE,
+    RESERVATION_MAX_DAYS,
+)
 from rooms.models import Reservation, Room
 
 
-class RoomRetrieveSerializer(serializers.ModelSerializer):
+class RoomRetrieveSerializer(
+    SerializerMetricsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Room
         fields = ("id", "name", "capacity", "price_per_day")
 
 
-class ReservationRetrieveSerializer(serializers.ModelSerializer):
+class RoomGroupQuerySerializer(serializers.Serializer):
+    guests = serializers.IntegerField(
+        min_value=1, max_value=GROUP_SEARCH_MAX_GUESTS
+    )
+    limit = serializers.IntegerField(
+        min_value=1, max_value=GROUP_SEARCH_MAX_RESULTS, default=5
+    )
+
+
+class RoomGroupSerializer(SerializerMetricsMixin, serializers.Serializer):
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2)
+    capacity = serializers.IntegerField()
+    rooms = RoomRetrieveSerializer(many=True)
+
+
+class ReservationRetrieveSerializer(
+    SerializerMetricsMixin, serializers.ModelSerializer
+):
     room = RoomRetrieveSerializer()
 
     class Meta:
@@ -16,7 +45,134 @@ class ReservationRetrieveSerializer(serializers.ModelSerializer):
         fields = ("id", "start_date", "end_date", "room", "user")
 
 
-class ReservationCreateSerializer(serializers.ModelSerializer):
+class ReservationValuesSerializer:
+    """
+    Read-only serializer building the ReservationRetrieveSerializer
+    representation straight from .values() rows, without model instances
+    """
+
+    values_fields = (
+        "id",
+        "start_date",
+        "end_date",
+        "user_id",
+        "room_id",
+        "room__name",
+        "room__capacity",
+        "room__price_per_day",
+    )
+    datetime_field = serializers.DateTimeField()
+    price_field = serializers.DecimalField(max_digits=8, decimal_places=2)
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @property
+    def data(self):
+        with track_serializer_time():
+            return [self.to_representation(row) for row in self.rows]
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "start_date": self.datetime_field.to_representation(
+                row["start_date"]
+            ),
+            "end_date": self.datetime_field.to_representation(row["end_date"]),
+            "room": {
+                "id": row["room_id"],
+                "name": row["room__name"],
+                "capacity": row["room__capacity"],
+                "price_per_day": self.price_field.to_representation(
+                    row["room__price_per_day"]
+                ),
+            },
+            "user": row["user_id"],
+        }
+
+
+class ReservationCreateSerializer(
+    SerializerMetricsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Reservation
         fields = ("start_date", "end_date", "room")
+
+
+class ReservationBulkItemSerializer(
+    SerializerMetricsMixin, serializers.Serializer
+):
+    room = serializers.IntegerField()
+    start_date = serializers.DateTimeField()
+    end_date = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs["start_date"] >= attrs["end_date"]:
+            raise serializers.ValidationError(
+                "Start date must be before end date."
+            )
+        if attrs["end_date"] - attrs["start_date"] > timedelta(
+            days=RESERVATION_MAX_DAYS
+        ):
+            raise serializers.ValidationError(
+                f"Reservation must not exceed {RESERVATION_MAX_DAYS} days."
+            )
+        return attrs
+
+
+class ReservationBulkCreateSerializer(
+    SerializerMetricsMixin, serializers.Serializer
+):
+    reservations = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=RESERVATION_BULK_MAX_SIZE,
+    )
+    all_or_nothing = serializers.BooleanField(default=False)
+
+
+class ReservationBulkResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=["created", "rejected"])
+    reservation = ReservationRetrieveSerializer(required=False)
+    errors = serializers.JSONField(required=False)
+
+
+class ReservationBulkResponseSerializer(
+    SerializerMetricsMixin, serializers.Serializer
+):
+    created = serializers.IntegerField()
+    results = ReservationBulkResultSerializer(many=True)
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    is_free = serializers.BooleanField()
+
+
+class RoomCalendarSerializer(SerializerMetricsMixin, serializers.Serializer):
+    room = serializers.IntegerField()
+    days = CalendarDaySerializer(many=True)
+
+
+class FreeWindowQuerySerializer(serializers.Serializer):
+    after = serializers.DateTimeField(required=False)
+    days = serializers.IntegerField(
+        min_value=1, max_value=RESERVATION_MAX_DAYS
+    )
+    horizon = serializers.IntegerField(
+        min_value=1, max_value=FREE_WINDOW_MAX_HORIZON_DAYS, default=90
+    )
+
+
+class FreeWindowSerializer(SerializerMetricsMixin, serializers.Serializer):
+    room = serializers.IntegerField()
+    start_date = serializers.DateTimeField(allow_null=True)
+    end_date = serializers.DateTimeField(allow_null=True)
+
+
+class OccupancyDaySerializer(SerializerMetricsMixin, serializers.Serializer):
+    date = serializers.DateField()
+    occupied_rooms = serializers.IntegerField()
+    total_rooms = serializers.IntegerField()
+    occupancy = serializers.FloatField()
@@ -0,0 +1,134 @@
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rooms.availability import AVAILABILITY_VERSION, availability_index
+from rooms.cache import (
+    AVAILABLE_ROOMS_VERSION,
+    RESERVATION_LISTS_VERSION,
+    RESERVATIONS_VERSION,
+    user_reservations_version,
+)
+from rooms.catalog import ROOM_CATALOG_VERSION, room_catalog
+from rooms.models import Reservation, Room
+from rooms.occupancy import rebuild_occupancy
+from rooms.occupancy import reservation_saved as update_occupancy
+from rooms.versions import bump_version
+
+
+@receiver(post_save, sender=Reservation)
+def reservation_saved(sender, instance, using, **kwargs):
+    transaction.on_commit(
+        partial(
+            availability_index.reservation_saved,
+            instance.pk,
+            instance.room_id,
+            instance.start_date,
+            instance.end_date,
+        ),
+        using=using,
+    )
+
+
+@receiver(post_save, sender=Reservation)
+def reservation_occupancy_saved(sender, instance, created, using, **kwargs):
+    # Written in the saving transaction, Reservation.save opens one, so the
+    # rows commit or roll back with the reservation. Deleted reservations
+    # take their occupancy rows along by cascade.
+    update_occupancy(instance, created, using)
+
+
+@receiver(post_delete, sender=Reservation)
+def reservation_deleted(sender, instance, using, **kwargs):
+    transaction.on_commit(
+        partial(availability_index.reservation_deleted, instance.pk),
+        using=using,
+    )
+
+
+@receiver(post_save, sender=Room)
+def room_saved(sender, instance, using, **kwargs):
+    transaction.on_commit(
+        partial(
+            room_catalog.room_saved,
+            instance.pk,
+            instance.name,
+            instance.price_per_day,
+            instance.capacity,
+        ),
+        using=using,
+    )
+
+
+@receiver(post_delete, sender=Room)
+def room_deleted(sender, instance, using, **kwargs):
+    transaction.on_commit(
+        partial(room_catalog.room_deleted, instance.pk), using=using
+    )
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_available_rooms(sender, using, **kwargs):
+    transaction.on_commit(
+        partial(bump_version, AVAILABLE_ROOMS_VERSION), using=using
+    )
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def invalidate_reservation_lists(
+    sender, instance, using, created=True, **kwargs
+):
+    # Deletions come without created. An updated reservation may have
+    # moved to another user, whose id is gone by now, so all lists are
+    # invalidated then.
+    if created:
+        versions = (
+            RESERVATIONS_VERSION,
+            user_reservations_version(instance.user_id),
+        )
+    else:
+        versions = (RESERVATION_LISTS_VERSION,)
+    for version in versions:
+        transaction.on_commit(partial(bump_version, version), using=using)
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room_reservation_lists(sender, using, **kwargs):
+    transaction.on_commit(
+        partial(bump_version, RESERVATION_LISTS_VERSION), using=using
+    )
+
+
+def reservations_changed_in_bulk(using=DEFAULT_DB_ALIAS, occupancy=True):
+    """
+    Refresh the state derived from reservations after bulk writes that
+    bypass the model signals, e.g. raw SQL or seeding. Callers that already
+    updated the occupancy rows pass occupancy=False.
+    """
+    if occupancy:
+        rebuild_occupancy(using)
+    for version in (
+        AVAILABILITY_VERSION,
+        AVAILABLE_ROOMS_VERSION,
+        RESERVATION_LISTS_VERSION,
+    ):
+        transaction.on_commit(partial(bump_version, version), using=using)
+
+
+def rooms_changed_in_bulk(using=DEFAULT_DB_ALIAS):
+    """
+    Refresh the state derived from rooms after bulk writes that bypass the
+    model signals
+    """
+    for version in (
+        ROOM_CATALOG_VERSION,
+        AVAILABLE_ROOMS_VERSION,
+        RESERVATION_LISTS_VERSION,
+    ):
+        transaction.on_commit(partial(bump_version, version), using=using)
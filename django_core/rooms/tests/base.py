@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rooms.models import Reservation, Room
+from users.models import User
+from users.serializers import TokenObtainPairSerializer
+
+# Features kept in worker memory or the cache are off unless a test
+# enables them
+plain_settings = override_settings(
+    AVAILABILITY_INDEX_ENABLED=False,
+    ROOM_CATALOG_ENABLED=False,
+    USE_ENDPOINT_CACHE=False,
+    CONDITIONAL_LISTS_ENABLED=False,
+    OCCUPANCY_LOOKUPS_ENABLED=False,
+    USER_CACHE_TTL=0,
+    METRICS_ENABLED=False,
+)
+
+
+def create_user(email, role=User.Role.CUSTOMER):
+    return User.objects.create_user(
+        email=email, password="password", role=role
+    )
+
+
+def create_rooms(count, price_per_day=100, capacity=2):
+    return Room.objects.bulk_create(
+        Room(
+            name=f"Room {number}",
+            price_per_day=price_per_day,
+            capacity=capacity,
+        )
+        for number in range(count)
+    )
+
+
+def reserve(room, user, start, days=1):
+    return Reservation.objects.create(
+        room=room,
+        user=user,
+        start_date=start,
+        end_date=start + timedelta(days=days),
+    )
+
+
+def future(days=30):
+    """
+    Midnight days from now, so periods cover whole local days
+    """
+    return timezone.localtime().replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ) + timedelta(days=days)
+
+
+@plain_settings
+class APITest(APITestCase):
+    def setUp(self):
+        # Versions and cached responses must not leak between tests
+        cache.clear()
+
+    def authenticate(self, user):
+        token = TokenObtainPairSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
@@ -0,0 +1,34 @@
+from django.contrib.admin.sites import site
+from django.test import RequestFactory, TestCase
+from rooms.models import Reservation
+from rooms.tests.base import create_rooms, create_user, future, reserve
+
+
+class ReservationAdminSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = create_user("guest@example.com")
+        cls.other = create_user("other@example.com")
+        first, second, third = create_rooms(3)
+        cls.by_email = reserve(first, cls.guest, future())
+        cls.by_name = reserve(second, cls.other, future())
+        reserve(third, cls.other, future())
+        second.name = "Guest suite"
+        second.save()
+
+    def search(self, term):
+        model_admin = site._registry[Reservation]
+        request = RequestFactory().get("/")
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            request, Reservation.objects.all(), term
+        )
+        self.assertFalse(may_have_duplicates)
+        return queryset
+
+    def test_matches_email_or_room_name_in_one_query(self):
+        with self.assertNumQueries(1):
+            found = set(self.search(" GUEST "))
+        self.assertEqual(found, {self.by_email, self.by_name})
+
+    def test_blank_term(self):
+        self.assertEqual(self.search(" ").count(), 3)
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from rooms.availability import (
+    AVAILABILITY_VERSION,
+    AvailabilityIndex,
+    _change_key,
+)
+from rooms.tests.base import (
+    APITest,
+    create_rooms,
+    create_user,
+    future,
+    reserve,
+)
+from rooms.versions import bump_version, get_version
+
+
+class AvailabilityIndexTest(APITest):
+    """
+    Two indexes stand for the indexes of two workers sharing the cache
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("customer@example.com")
+        cls.rooms = create_rooms(3)
+        cls.start = future()
+
+    def setUp(self):
+        super().setUp()
+        reserve(self.rooms[0], self.user, self.start)
+        self.writer = AvailabilityIndex()
+        self.reader = AvailabilityIndex()
+        for index in (self.writer, self.reader):
+            self.assertEqual(self.busy(index), [self.rooms[0].id])
+
+    def busy(self, index, days=1):
+        return sorted(
+            index.busy_room_ids(self.start, self.start + timedelta(days=days))
+        )
+
+    def save(self, reservation):
+        # What the post_save receiver does once the transaction commits
+        self.writer.reservation_saved(
+            reservation.id,
+            reservation.room_id,
+            reservation.start_date,
+            reservation.end_date,
+        )
+
+    def no_reload(self, *indexes):
+        for index in indexes:
+            patcher = mock.patch.object(
+                index, "_read", side_effect=AssertionError("reloaded")
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_other_workers_apply_changes(self):
+        self.no_reload(self.writer, self.reader)
+        reservation = reserve(self.rooms[1], self.user, self.start)
+        self.save(reservation)
+        expected = [self.rooms[0].id, self.rooms[1].id]
+        self.assertEqual(self.busy(self.writer), expected)
+        self.assertEqual(self.busy(self.reader), expected)
+
+        # Moved to another room and later
+        reservation.room = self.rooms[2]
+        reservation.start_date += timedelta(days=2)
+        reservation.end_date += timedelta(days=2)
+        reservation.save()
+        self.save(reservation)
+        self.assertEqual(self.busy(self.reader), [self.rooms[0].id])
+        self.assertEqual(
+            self.busy(self.reader, days=3),
+            [self.rooms[0].id, self.rooms[2].id],
+        )
+
+        reservation_id = reservation.id
+        reservation.delete()
+        self.writer.reservation_deleted(reservation_id)
+        self.assertEqual(self.busy(self.reader, days=3), [self.rooms[0].id])
+        self.assertEqual(
+            get_version(AVAILABILITY_VERSION), self.reader._version
+        )
+
+    def test_changes_of_several_writes(self):
+        self.no_reload(self.reader)
+        for room in self.rooms[1:]:
+            self.save(reserve(room, self.user, self.start))
+        self.assertEqual(
+            self.busy(self.reader), [room.id for room in self.rooms]
+        )
+
+    def test_writer_behind_catches_up(self):
+        self.no_reload(self.writer, self.reader)
+        other_writer = AvailabilityIndex()
+        other_writer._version = self.writer._version
+        reservation = reserve(self.rooms[1], self.user, self.start)
+        other_writer.reservation_saved(
+            reservation.id,
+            reservation.room_id,
+            reservation.start_date,
+            reservation.end_date,
+        )
+        # The writer doesn't apply its own change out of order
+        self.save(reserve(self.rooms[2], self.user, self.start))
+        self.assertEqual(
+            self.busy(self.writer), [room.id for room in self.rooms]
+        )
+
+    def test_missing_change_reloads(self):
+        reservation = reserve(self.rooms[1], self.user, self.start)
+        self.save(reservation)
+        cache.delete(_change_key(get_version(AVAILABILITY_VERSION)))
+        with mock.patch.object(
+            self.reader, "_read", wraps=self.reader._read
+        ) as read:
+            self.assertEqual(
+                self.busy(self.reader), [self.rooms[0].id, self.rooms[1].id]
+            )
+        read.assert_called_once()
+
+    def test_bulk_writes_reload(self):
+        # Bulk writes bump the version without change records
+        reserve(self.rooms[2], self.user, self.start)
+        bump_version(AVAILABILITY_VERSION)
+        self.assertEqual(
+            self.busy(self.reader), [self.rooms[0].id, self.rooms[2].id]
+        )
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from rooms.tests.base import (
+    APITest,
+    create_rooms,
+    create_user,
+    future,
+    reserve,
+)
+from users.models import User
+
+
+@override_settings(CONDITIONAL_LISTS_ENABLED=True)
+class ConditionalListsTest(APITest):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = create_user("customer@example.com")
+        cls.other = create_user("other@example.com")
+        cls.admin = create_user("admin@example.com", User.Role.ADMIN)
+        cls.rooms = create_rooms(3)
+        cls.start = future()
+        reserve(cls.rooms[0], cls.customer, cls.start)
+        cls.period = {
+            "start_date": cls.start.isoformat(),
+            "end_date": (cls.start + timedelta(days=1)).isoformat(),
+        }
+
+    def get_reservations(self, etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.client.get("/api/rooms/reservations/", headers=headers)
+
+    def get_available_rooms(self, etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.client.get(
+            "/api/rooms/rooms/available/", self.period, headers=headers
+        )
+
+    def test_not_modified_without_queries(self):
+        self.authenticate(self.customer)
+        response = self.get_reservations()
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.get_reservations(response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_own_reservation_changes_etag(self):
+        self.authenticate(self.customer)
+        etag = self.get_reservations()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve(self.rooms[1], self.customer, self.start)
+        response = self.get_reservations(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_other_users_reservation_keeps_etag(self):
+        self.authenticate(self.customer)
+        etag = self.get_reservations()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve(self.rooms[1], self.other, self.start)
+        self.assertEqual(self.get_reservations(etag).status_code, 304)
+
+        # Admins see every reservation
+        self.authenticate(self.admin)
+        etag = self.get_reservations()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve(self.rooms[2], self.other, self.start)
+        self.assertEqual(self.get_reservations(etag).status_code, 200)
+
+    def test_etag_depends_on_query(self):
+        self.authenticate(self.customer)
+        etag = self.get_reservations()["ETag"]
+        response = self.client.get(
+            "/api/rooms/reservations/?pagination=cursor",
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_available_rooms(self):
+        response = self.get_available_rooms()
+        self.assertEqual(response.data["count"], 2)
+        etag = response["ETag"]
+        self.assertEqual(self.get_available_rooms(etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve(self.rooms[1], self.other, self.start)
+        response = self.get_available_rooms(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_room_change_changes_etag(self):
+        etag = self.get_available_rooms()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rooms[2].price_per_day = 50
+            self.rooms[2].save()
+        self.assertEqual(self.get_available_rooms(etag).status_code, 200)
@@ -0,0 +1,76 @@
+import random
+from decimal import Decimal
+from itertools import combinations
+
+from django.test import SimpleTestCase
+from rooms.grouping import cheapest_groups
+from rooms.models import Room
+
+
+def make_rooms(*types):
+    return [
+        Room(id=number, capacity=capacity, price_per_day=Decimal(price))
+        for number, (capacity, price) in enumerate(types, start=1)
+    ]
+
+
+def brute_force_totals(rooms, guests, limit):
+    """
+    Totals of the limit cheapest distinct minimal groups, found by trying
+    every subset of the rooms
+    """
+    groups = {}
+    for size in range(1, len(rooms) + 1):
+        for group in combinations(rooms, size):
+            capacities = [room.capacity for room in group]
+            seated = sum(capacities)
+            # Minimal: without its smallest room somebody has no seat
+            if seated < guests or seated - min(capacities) >= guests:
+                continue
+            key = tuple(
+                sorted((room.capacity, room.price_per_day) for room in group)
+            )
+            groups[key] = sum(room.price_per_day for room in group)
+    return sorted(groups.values())[:limit]
+
+
+class CheapestGroupsTest(SimpleTestCase):
+    def totals(self, rooms, guests, limit):
+        return [total for total, _ in cheapest_groups(rooms, guests, limit)]
+
+    def test_identical_rooms_leave_room_for_other_groups(self):
+        rooms = make_rooms((3, "10"), (3, "10"), (3, "15.5"))
+        self.assertEqual(self.totals(rooms, 3, 2), [10, Decimal("15.5")])
+
+        rooms = make_rooms((5, "20"), (5, "20"), (5, "20"), (5, "30"))
+        self.assertEqual(self.totals(rooms, 5, 2), [20, 30])
+
+    def test_groups_seat_everybody(self):
+        rooms = make_rooms((1, "5"), (2, "8"), (4, "20"), (2, "9"))
+        for total, group in cheapest_groups(rooms, 5, 5):
+            self.assertGreaterEqual(sum(room.capacity for room in group), 5)
+            self.assertEqual(total, sum(room.price_per_day for room in group))
+
+    def test_matches_brute_force(self):
+        generator = random.Random(1)
+        for _ in range(300):
+            rooms = make_rooms(
+                *(
+                    (
+                        generator.randint(1, 4),
+                        generator.choice(["1", "2", "3", "5", "8"]),
+                    )
+                    for _ in range(generator.randint(1, 8))
+                )
+            )
+            guests = generator.randint(1, 10)
+            limit = generator.randint(1, 5)
+            with self.subTest(
+                rooms=[(room.capacity, room.price_per_day) for room in rooms],
+                guests=guests,
+                limit=limit,
+            ):
+                self.assertEqual(
+                    self.totals(rooms, guests, limit),
+                    brute_force_totals(rooms, guests, limit),
+                )
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.test import TestCase
+from rooms.bulk import create_reservations
+from rooms.models import RoomDayOccupancy
+from rooms.occupancy import (
+    find_inconsistencies,
+    rebuild_occupancy,
+    reservation_days,
+)
+from rooms.tests.base import (
+    create_rooms,
+    create_user,
+    future,
+    plain_settings,
+    reserve,
+)
+
+
+@plain_settings
+class OccupancyTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("customer@example.com")
+        cls.rooms = create_rooms(2)
+        cls.start = future()
+
+    def assertOccupancy(self, reservation):
+        self.assertEqual(
+            sorted(
+                RoomDayOccupancy.objects.filter(
+                    reservation_id=reservation.id
+                ).values_list("room_id", "day")
+            ),
+            [
+                (reservation.room_id, day)
+                for day in reservation_days(
+                    reservation.start_date, reservation.end_date
+                )
+            ],
+        )
+
+    def test_rows_written_on_create(self):
+        reservation = reserve(self.rooms[0], self.user, self.start, days=3)
+        self.assertOccupancy(reservation)
+        self.assertEqual(find_inconsistencies(), ([], []))
+
+    def test_rows_replaced_on_update(self):
+        reservation = reserve(self.rooms[0], self.user, self.start, days=3)
+        reservation.room = self.rooms[1]
+        reservation.start_date += timedelta(days=10)
+        reservation.end_date += timedelta(days=11)
+        reservation.save()
+        self.assertOccupancy(reservation)
+        self.assertFalse(
+            RoomDayOccupancy.objects.filter(room=self.rooms[0]).exists()
+        )
+
+    def test_rows_deleted_with_reservation(self):
+        reservation = reserve(self.rooms[0], self.user, self.start, days=3)
+        reservation.delete()
+        self.assertFalse(RoomDayOccupancy.objects.exists())
+
+    def test_rows_rolled_back_with_reservation(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            reserve(self.rooms[0], self.user, self.start, days=3)
+            self.assertTrue(RoomDayOccupancy.objects.exists())
+            raise RuntimeError
+        self.assertFalse(RoomDayOccupancy.objects.exists())
+
+    def test_rows_written_for_bulk_created_reservations(self):
+        results = create_reservations(
+            self.user,
+            [
+                {
+                    "room": room.id,
+                    "start_date": self.start.isoformat(),
+                    "end_date": (self.start + timedelta(days=2)).isoformat(),
+                }
+                for room in self.rooms
+            ],
+        )
+        self.assertEqual(
+            [result["status"] for result in results], ["created", "created"]
+        )
+        self.assertEqual(RoomDayOccupancy.objects.count(), 4)
+        self.assertEqual(find_inconsistencies(), ([], []))
+
+    def test_rebuild(self):
+        reservations = [
+            reserve(self.rooms[0], self.user, self.start, days=3),
+            reserve(self.rooms[1], self.user, self.start, days=2),
+        ]
+        # Stale rows are dropped, missing ones restored
+        RoomDayOccupancy.objects.filter(
+            reservation_id=reservations[0].id
+        ).delete()
+        RoomDayOccupancy.objects.create(
+            room=self.rooms[0],
+            day=self.start.date() - timedelta(days=1),
+            reservation_id=reservations[1].id,
+        )
+
+        self.assertEqual(rebuild_occupancy(), 5)
+        for reservation in reservations:
+            self.assertOccupancy(reservation)
+        self.assertEqual(find_inconsistencies(), ([], []))
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from rooms.models import Reservation
+from rooms.tests.base import APITest, create_rooms, create_user, future
+
+
+class PaginationTest(APITest):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = create_user("customer@example.com")
+        rooms = create_rooms(5)
+        start = future()
+        # Reservations share start dates, so the id breaks the ties
+        Reservation.objects.bulk_create(
+            Reservation(
+                room=room,
+                user=cls.customer,
+                start_date=start + timedelta(days=day * 2),
+                end_date=start + timedelta(days=day * 2 + 1),
+            )
+            for room in rooms
+            for day in range(5)
+        )
+        cls.expected = list(
+            Reservation.objects.order_by("start_date", "id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate(self.customer)
+
+    def ids(self, response):
+        return [reservation["id"] for reservation in response.data["results"]]
+
+    def test_page_numbers(self):
+        response = self.client.get("/api/rooms/reservations/?page=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(self.ids(response), self.expected[10:20])
+        self.assertEqual(
+            self.client.get("/api/rooms/reservations/?page=4").status_code,
+            404,
+        )
+
+    def test_cursor_walks_every_row_once(self):
+        url = "/api/rooms/reservations/?pagination=cursor"
+        seen = []
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen += self.ids(response)
+            pages.append(response.data)
+            url = response.data["next"]
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        # Back from the last page
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(self.ids(response), self.expected[10:20])
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(self.ids(response), self.expected[:10])
+        self.assertIsNone(response.data["previous"])
+
+    def test_cursor_skips_rows_removed_meanwhile(self):
+        response = self.client.get(
+            "/api/rooms/reservations/?pagination=cursor"
+        )
+        Reservation.objects.filter(id=self.expected[10]).delete()
+        response = self.client.get(response.data["next"])
+        self.assertEqual(self.ids(response), self.expected[11:21])
+
+    def test_invalid_cursor(self):
+        for cursor in ("nonsense", "eyJ2IjogWzFdLCAiciI6IGZhbHNlfQ=="):
+            response = self.client.get(
+                f"/api/rooms/reservations/?cursor={cursor}"
+            )
+            self.assertEqual(response.status_code, 404)
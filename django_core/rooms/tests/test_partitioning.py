@@ -0,0 +1,92 @@
+from django.db import connection
+from django.test import TestCase
+from rooms.availability import AVAILABILITY_VERSION
+from rooms.cache import AVAILABLE_ROOMS_VERSION, RESERVATION_LISTS_VERSION
+from rooms.models import Reservation, RoomDayOccupancy
+from rooms.partitioning import (
+    convert_table,
+    detach_partitions,
+    get_partitions,
+    month_start,
+)
+from rooms.tests.base import (
+    create_rooms,
+    create_user,
+    future,
+    plain_settings,
+    reserve,
+)
+from rooms.versions import get_version
+
+VERSIONS = (
+    AVAILABILITY_VERSION,
+    AVAILABLE_ROOMS_VERSION,
+    RESERVATION_LISTS_VERSION,
+)
+
+
+@plain_settings
+class DetachPartitionsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("customer@example.com")
+        cls.room = create_rooms(1)[0]
+        cls.old = reserve(cls.room, cls.user, future(-90), days=2)
+        cls.recent = reserve(cls.room, cls.user, future(), days=2)
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            # The overlap constraints of partitions need btree_gist
+            cursor.execute(
+                "SELECT 1 FROM pg_extension WHERE extname = 'btree_gist'"
+            )
+            if cursor.fetchone() is None:
+                self.skipTest("btree_gist is not installed")
+        # ALTER TABLE refuses tables with deferred checks pending
+        connection.check_constraints()
+        with connection.schema_editor() as schema_editor:
+            convert_table(schema_editor, months_ahead=1)
+
+    def detach(self, **kwargs):
+        before = month_start(self.recent.start_date)
+        versions = [get_version(version) for version in VERSIONS]
+        with self.captureOnCommitCallbacks(execute=True):
+            with connection.schema_editor() as schema_editor:
+                detached = detach_partitions(schema_editor, before, **kwargs)
+        self.assertTrue(detached)
+        for version, previous in zip(VERSIONS, versions):
+            self.assertNotEqual(get_version(version), previous)
+        return detached
+
+    def assertOldReservationGone(self):
+        self.assertFalse(Reservation.objects.filter(id=self.old.id).exists())
+        self.assertFalse(
+            RoomDayOccupancy.objects.filter(
+                reservation_id=self.old.id
+            ).exists()
+        )
+        self.assertEqual(
+            RoomDayOccupancy.objects.filter(
+                reservation_id=self.recent.id
+            ).count(),
+            2,
+        )
+
+    def test_archive(self):
+        detached = self.detach()
+        self.assertOldReservationGone()
+        with connection.cursor() as cursor:
+            names = [name for name, _, _ in get_partitions(cursor)]
+            self.assertTrue(set(detached).isdisjoint(names))
+            cursor.execute(
+                " UNION ALL ".join(
+                    f"SELECT id FROM {connection.ops.quote_name(name)}"
+                    for name in detached
+                )
+            )
+            archived = [reservation_id for reservation_id, in cursor]
+        self.assertEqual(archived, [self.old.id])
+
+    def test_drop(self):
+        self.detach(drop=True)
+        self.assertOldReservationGone()
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from rooms.models import Reservation
+from rooms.tests.base import APITest, create_rooms, create_user, future
+from users.models import User
+
+
+class ListQueriesTest(APITest):
+    """
+    The number of queries of the list endpoints doesn't grow with the page
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = create_user("customer@example.com")
+        cls.admin = create_user("admin@example.com", User.Role.ADMIN)
+        rooms = create_rooms(10)
+        start = future()
+        Reservation.objects.bulk_create(
+            Reservation(
+                room=room,
+                user=cls.customer if number % 2 else cls.admin,
+                start_date=start + timedelta(days=day * 2 + number % 2),
+                end_date=start + timedelta(days=day * 2 + number % 2 + 1),
+            )
+            for number, room in enumerate(rooms)
+            for day in range(3)
+        )
+        cls.period = {
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=1)).isoformat(),
+        }
+
+    def test_customer_reservations(self):
+        self.authenticate(self.customer)
+        # Count and page
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/rooms/reservations/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 15)
+
+    def test_admin_reservations(self):
+        self.authenticate(self.admin)
+        # Role check, count and page
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/rooms/reservations/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 30)
+
+    def test_available_rooms(self):
+        # Count and page
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/rooms/rooms/available/", self.period
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 5)
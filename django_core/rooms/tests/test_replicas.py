@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.test import SimpleTestCase, override_settings
+from django_core.db_routers import (
+    ReplicaRouter,
+    RoutingState,
+    _routing_state,
+    read_from_primary,
+)
+from rooms.models import Reservation
+from rooms.tests.base import APITest, create_rooms, create_user, future
+
+
+class RoutingMixin:
+    def route(self, **state):
+        self.state = RoutingState(**state)
+        token = _routing_state.set(self.state)
+        self.addCleanup(_routing_state.reset, token)
+
+
+class ReplicaRouterTest(RoutingMixin, SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.router.replicas = ["replica_1"]
+
+    def test_outside_requests(self):
+        self.assertEqual(
+            self.router.db_for_read(Reservation), DEFAULT_DB_ALIAS
+        )
+
+    def test_safe_request_reads_from_replica(self):
+        self.route()
+        self.assertEqual(self.router.db_for_read(Reservation), "replica_1")
+
+    def test_writes_go_to_primary(self):
+        self.route()
+        self.assertEqual(
+            self.router.db_for_write(Reservation), DEFAULT_DB_ALIAS
+        )
+        self.assertTrue(self.state.wrote)
+
+    def test_read_from_primary(self):
+        self.route()
+        read_from_primary()
+        self.assertEqual(
+            self.router.db_for_read(Reservation), DEFAULT_DB_ALIAS
+        )
+
+    def test_read_from_primary_outside_requests(self):
+        # Nothing to switch, reads go to the primary anyway
+        read_from_primary()
+        self.assertEqual(
+            self.router.db_for_read(Reservation), DEFAULT_DB_ALIAS
+        )
+
+
+class ReplicaRouterTransactionTest(RoutingMixin, APITest):
+    def test_transactions_read_from_primary(self):
+        router = ReplicaRouter()
+        router.replicas = ["replica_1"]
+        self.route()
+        # The test itself runs in a transaction
+        with transaction.atomic():
+            self.assertEqual(router.db_for_read(Reservation), DEFAULT_DB_ALIAS)
+
+
+class VersionedListsReadFromPrimaryTest(RoutingMixin, APITest):
+    """
+    Lists cached or tagged under a version are read from the primary, a
+    lagging replica would store old rows under the new version
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = create_user("customer@example.com")
+        cls.start = future()
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate(self.customer)
+        self.route()
+
+    def get_available_rooms(self):
+        return self.client.get(
+            "/api/rooms/rooms/available/",
+            {
+                "start_date": self.start.isoformat(),
+                "end_date": (self.start + timedelta(days=1)).isoformat(),
+            },
+        )
+
+    def test_plain_lists_read_from_replicas(self):
+        self.client.get("/api/rooms/reservations/")
+        self.get_available_rooms()
+        self.assertFalse(self.state.use_primary)
+
+    @override_settings(CONDITIONAL_LISTS_ENABLED=True)
+    def test_reservations_with_etags(self):
+        self.client.get("/api/rooms/reservations/")
+        self.assertTrue(self.state.use_primary)
+
+    @override_settings(CONDITIONAL_LISTS_ENABLED=True)
+    def test_available_rooms_with_etags(self):
+        create_rooms(1)
+        self.get_available_rooms()
+        self.assertTrue(self.state.use_primary)
+
+    @override_settings(USE_ENDPOINT_CACHE=True)
+    def test_cached_available_rooms(self):
+        self.get_available_rooms()
+        self.assertTrue(self.state.use_primary)
@@ -0,0 +1,68 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django_core.schema import StoredSchemaView
+
+SCHEMA_URL = "/api/docs/?format=json"
+
+
+class StoredSchemaTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "openapi.json"
+        settings = override_settings(
+            OPENAPI_SCHEMA_FILE=str(self.path), DEBUG=False
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Each test starts with a fresh worker
+        for name, value in (("_schema", None), ("_rendered", {})):
+            patcher = patch.object(StoredSchemaView, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(
+            StoredSchemaView,
+            "load_schema",
+            autospec=True,
+            side_effect=StoredSchemaView.load_schema,
+        )
+        self.load_schema = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertServedOnce(self):
+        response = self.client.get(SCHEMA_URL)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        schema = json.loads(response.content)
+
+        response = self.client.get(SCHEMA_URL, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            SCHEMA_URL, headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.load_schema.call_count, 1)
+        return schema
+
+    def test_stored_file(self):
+        stored = {"openapi": "3.0.3", "info": {"title": "Stored"}, "paths": {}}
+        self.path.write_text(json.dumps(stored))
+        self.assertEqual(self.assertServedOnce(), stored)
+
+    def test_missing_file_generated_once(self):
+        schema = self.assertServedOnce()
+        self.assertIn("/api/rooms/reservations/", schema["paths"])
+        self.assertFalse(self.path.exists())
+
+    @override_settings(DEBUG=True)
+    def test_missing_file_generated_per_request_under_debug(self):
+        for _ in range(2):
+            response = self.client.get(SCHEMA_URL)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("ETag", response)
+        self.load_schema.assert_not_called()
@@ -1,8 +1,13 @@
 from rest_framework.routers import DefaultRouter
-from rooms.views import RoomViewSet, ReservationViewSet
+from rooms.views import (
+    ReservationViewSet,
+    RoomCalendarViewSet,
+    RoomViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"rooms/available", RoomViewSet, basename="available-rooms")
+router.register(r"rooms", RoomCalendarViewSet, basename="rooms")
 router.register(r"reservations", ReservationViewSet, basename="reservations")
 
 urlpatterns = router.urls
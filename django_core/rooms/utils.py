@@ -0,0 +1,26 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def parse_datetime_param(value):
+    """
+    Parse datetime query parameter, naive values are treated
+    as the current time zone. Returns None for missing or invalid values.
+    """
+    try:
+        parsed = parse_datetime(value or "")
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_date_param(value):
+    """
+    Parse date query parameter. Returns None for missing or invalid values.
+    """
+    try:
+        return parse_date(value or "")
+    except ValueError:
+        return None
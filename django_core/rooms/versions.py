@@ -0,0 +1,31 @@
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = "versions"
+
+
+def _key(name):
+    return f"{VERSION_KEY_PREFIX}:{name}"
+
+
+def _seed():
+    # Seeding from the clock keeps versions monotonic even if the counter
+    # gets evicted from the cache and has to be created again.
+    return time.time_ns() // 1000
+
+
+def get_version(name):
+    version = cache.get(_key(name))
+    if version is None:
+        cache.add(_key(name), _seed(), timeout=None)
+        version = cache.get(_key(name))
+    return version
+
+
+def bump_version(name):
+    try:
+        return cache.incr(_key(name))
+    except ValueError:
+        cache.add(_key(name), _seed(), timeout=None)
+        return cache.incr(_key(name))
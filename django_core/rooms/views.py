@@ -1,23 +1,82 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
-from django.db.models import Q
-from django.utils.dateparse import parse_datetime
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django_core.db_routers import read_from_primary
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiParameter,
     extend_schema,
     extend_schema_view,
 )
 from rest_framework import mixins, serializers, status, viewsets
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import (
+    AllowAny,
+    IsAdminUser,
+    IsAuthenticated,
+)
 from rest_framework.response import Response
+from rooms.availability import availability_index
+from rooms.bulk import create_reservations
+from rooms.cache import (
+    conditional_response,
+    get_available_rooms_cache_key,
+    get_available_rooms_etag,
+    get_reservations_etag,
+)
+from rooms.calendar import build_calendars
+from rooms.catalog import room_catalog
+from rooms.constants import (
+    CALENDAR_MAX_DAYS,
+    FREE_WINDOW_MAX_HORIZON_DAYS,
+    GROUP_SEARCH_MAX_GUESTS,
+    GROUP_SEARCH_MAX_RESULTS,
+    RESERVATION_MAX_DAYS,
+)
+from rooms.export import (
+    EXPORT_FORMATS,
+    export_rows,
+    filter_export,
+    join_lines,
+)
 from rooms.filters import RoomFilter
-from rooms.models import Reservation, Room
+from rooms.grouping import cheapest_groups
+from rooms.models import Reservation, Room, reservation_constraint_message
+from rooms.occupancy import occupancy_report
+from rooms.partitioning import lock_rooms
 from rooms.serializers import (
+    FreeWindowQuerySerializer,
+    FreeWindowSerializer,
+    OccupancyDaySerializer,
+    ReservationBulkCreateSerializer,
+    ReservationBulkResponseSerializer,
     ReservationCreateSerializer,
     ReservationRetrieveSerializer,
+    ReservationValuesSerializer,
+    RoomCalendarSerializer,
+    RoomGroupQuerySerializer,
+    RoomGroupSerializer,
     RoomRetrieveSerializer,
 )
+from rooms.utils import parse_date_param, parse_datetime_param
+from rooms.windows import find_free_windows
+from users.authentication import StatelessJWTAuthentication, has_admin_role
+from users.permissions import IsAdmin
+
+room_filter_parameters = [
+    OpenApiParameter(name="min_price", type=float, required=False),
+    OpenApiParameter(name="max_price", type=float, required=False),
+    OpenApiParameter(name="min_capacity", type=int, required=False),
+    OpenApiParameter(name="max_capacity", type=int, required=False),
+]
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -26,34 +85,287 @@ from rooms.serializers import (
         parameters=[
             OpenApiParameter(name="start_date", type=datetime, required=True),
             OpenApiParameter(name="end_date", type=datetime, required=True),
-            OpenApiParameter(name="min_price", type=float, required=False),
-            OpenApiParameter(name="max_price", type=float, required=False),
-            OpenApiParameter(name="min_capacity", type=int, required=False),
-            OpenApiParameter(name="max_capacity", type=int, required=False),
+            *room_filter_parameters,
         ],
         responses=RoomRetrieveSerializer(many=True),
-    )
+    ),
+    group=extend_schema(
+        tags=["Rooms"],
+        description="Get the cheapest groups of rooms available for the "
+        "provided dates that together seat the given number of guests. "
+        "No room of a group can be left out without leaving a guest "
+        "without a seat",
+        parameters=[
+            OpenApiParameter(name="start_date", type=datetime, required=True),
+            OpenApiParameter(name="end_date", type=datetime, required=True),
+            OpenApiParameter(
+                name="guests",
+                type=int,
+                required=True,
+                description=f"At most {GROUP_SEARCH_MAX_GUESTS}",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                description="Number of groups, at most "
+                f"{GROUP_SEARCH_MAX_RESULTS}",
+            ),
+            *room_filter_parameters,
+        ],
+        responses=RoomGroupSerializer(many=True),
+    ),
 )
 class RoomViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     serializer_class = RoomRetrieveSerializer
+    keyset_ordering = ("price_per_day", "id")
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
     filterset_class = RoomFilter
 
     def get_queryset(self):
-        start_date = parse_datetime(
+        start_date = parse_datetime_param(
             self.request.query_params.get("start_date")
         )
-        end_date = parse_datetime(self.request.query_params.get("end_date"))
+        end_date = parse_datetime_param(
+            self.request.query_params.get("end_date")
+        )
 
         if not start_date or not end_date or start_date >= end_date:
             return Room.objects.none()
 
-        overlapping_reservations = Reservation.objects.filter(
-            Q(start_date__lt=end_date) & Q(end_date__gt=start_date)
-        ).values_list("room_id", flat=True)
+        if settings.AVAILABILITY_INDEX_ENABLED:
+            busy_room_ids = availability_index.busy_room_ids(
+                start_date, end_date
+            )
+        else:
+            busy_room_ids = Reservation.objects.overlapping(
+                start_date, end_date
+            ).values_list("room_id", flat=True)
+
+        if settings.ROOM_CATALOG_ENABLED:
+            return self.get_catalog_rooms(busy_room_ids)
+        return Room.objects.exclude(id__in=busy_room_ids)
+
+    def get_catalog_rooms(self, busy_room_ids):
+        """
+        Available rooms filtered and ordered in memory, as a list
+        """
+        filterset = RoomFilter(
+            self.request.query_params, queryset=Room.objects.none()
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return room_catalog.select(
+            busy_room_ids, **filterset.form.cleaned_data
+        )
+
+    def filter_queryset(self, queryset):
+        # Rooms of the catalog are filtered already
+        if isinstance(queryset, list):
+            return queryset
+        return super().filter_queryset(queryset)
+
+    @action(detail=False, pagination_class=None)
+    def group(self, request):
+        params = RoomGroupQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        rooms = self.filter_queryset(self.get_queryset())
+        groups = [
+            {
+                "total_price": total_price,
+                "capacity": sum(room.capacity for room in group),
+                "rooms": group,
+            }
+            for total_price, group in cheapest_groups(
+                rooms, **params.validated_data
+            )
+        ]
+        return Response(RoomGroupSerializer(groups, many=True).data)
+
+    def list(self, request, *args, **kwargs):
+        if settings.CONDITIONAL_LISTS_ENABLED or settings.USE_ENDPOINT_CACHE:
+            read_from_primary()
+        if not settings.CONDITIONAL_LISTS_ENABLED:
+            return self.get_list_response(request, *args, **kwargs)
+        return conditional_response(
+            request,
+            get_available_rooms_etag(request),
+            lambda: self.get_list_response(request, *args, **kwargs),
+        )
+
+    def get_list_response(self, request, *args, **kwargs):
+        if not settings.USE_ENDPOINT_CACHE:
+            return super().list(request, *args, **kwargs)
+
+        cache_key = get_available_rooms_cache_key(request)
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, settings.ENDPOINT_CACHE_TIMEOUT)
+        return Response(data)
+
+
+calendar_parameters = [
+    OpenApiParameter(name="from", type=date, required=True),
+    OpenApiParameter(
+        name="to",
+        type=date,
+        required=True,
+        description=f"Inclusive, at most {CALENDAR_MAX_DAYS} days after from",
+    ),
+]
+
 
-        return Room.objects.exclude(id__in=overlapping_reservations)
+free_window_parameters = [
+    OpenApiParameter(
+        name="after",
+        type=datetime,
+        description="Earliest start of the period, now by default",
+    ),
+    OpenApiParameter(
+        name="days",
+        type=int,
+        required=True,
+        description=f"Length of the period, at most {RESERVATION_MAX_DAYS}",
+    ),
+    OpenApiParameter(
+        name="horizon",
+        type=int,
+        description="Days after after the period may start in, at most "
+        f"{FREE_WINDOW_MAX_HORIZON_DAYS}",
+    ),
+]
+
+
+@extend_schema_view(
+    calendar=extend_schema(
+        tags=["Rooms"],
+        description="Get free/busy state of the room for every day "
+        "in the provided date range",
+        parameters=calendar_parameters,
+        responses=RoomCalendarSerializer,
+    ),
+    calendars=extend_schema(
+        tags=["Rooms"],
+        description="Get free/busy state of rooms for every day "
+        "in the provided date range",
+        parameters=[*calendar_parameters, *room_filter_parameters],
+        responses=RoomCalendarSerializer(many=True),
+    ),
+    next_free=extend_schema(
+        tags=["Rooms"],
+        description="Get the earliest period of the given number of days "
+        "the room is free for, starting within horizon days after the "
+        "provided date",
+        parameters=free_window_parameters,
+        responses=FreeWindowSerializer,
+    ),
+    next_free_rooms=extend_schema(
+        tags=["Rooms"],
+        description="Get the earliest period of the given number of days "
+        "every room is free for, starting within horizon days after the "
+        "provided date",
+        parameters=[*free_window_parameters, *room_filter_parameters],
+        responses=FreeWindowSerializer(many=True),
+    ),
+    occupancy=extend_schema(
+        tags=["Rooms"],
+        description="Get the number and share of rooms taken on every day "
+        "in the provided date range (admin only)",
+        parameters=[*calendar_parameters, *room_filter_parameters],
+        responses=OccupancyDaySerializer(many=True),
+    ),
+)
+class RoomCalendarViewSet(viewsets.GenericViewSet):
+    queryset = Room.objects.all()
+    serializer_class = RoomCalendarSerializer
+    keyset_ordering = ("id",)
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = RoomFilter
+
+    def get_date_range(self):
+        date_from = parse_date_param(self.request.query_params.get("from"))
+        date_to = parse_date_param(self.request.query_params.get("to"))
+
+        if not date_from or not date_to:
+            raise serializers.ValidationError(
+                "Valid from and to dates are required."
+            )
+        if date_from > date_to:
+            raise serializers.ValidationError(
+                "From date must not be after to date."
+            )
+        if (date_to - date_from).days >= CALENDAR_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Date range must not exceed {CALENDAR_MAX_DAYS} days."
+            )
+        return date_from, date_to
+
+    @action(detail=True)
+    def calendar(self, request, pk=None):
+        date_from, date_to = self.get_date_range()
+        room = self.get_object()
+        return Response(build_calendars([room.id], date_from, date_to)[0])
+
+    @action(detail=False, url_path="calendar", url_name="calendars")
+    def calendars(self, request):
+        date_from, date_to = self.get_date_range()
+        rooms = self.filter_queryset(self.get_queryset()).only("id")
+        page = self.paginate_queryset(rooms)
+        if page is not None:
+            rooms = page
+        calendars = build_calendars(
+            [room.id for room in rooms], date_from, date_to
+        )
+        if page is not None:
+            return self.get_paginated_response(calendars)
+        return Response(calendars)
+
+    def get_free_window_range(self):
+        params = FreeWindowQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        start_date = params.validated_data.get("after") or timezone.now()
+        return (
+            start_date,
+            timedelta(days=params.validated_data["days"]),
+            start_date + timedelta(days=params.validated_data["horizon"]),
+        )
+
+    @action(detail=True, url_path="next-free")
+    def next_free(self, request, pk=None):
+        window_range = self.get_free_window_range()
+        room = self.get_object()
+        return Response(
+            FreeWindowSerializer(
+                find_free_windows([room.id], *window_range)[0]
+            ).data
+        )
+
+    @action(detail=False, url_path="next-free", url_name="next-free-rooms")
+    def next_free_rooms(self, request):
+        window_range = self.get_free_window_range()
+        rooms = self.filter_queryset(self.get_queryset()).only("id")
+        page = self.paginate_queryset(rooms)
+        if page is not None:
+            rooms = page
+        windows = FreeWindowSerializer(
+            find_free_windows([room.id for room in rooms], *window_range),
+            many=True,
+        ).data
+        if page is not None:
+            return self.get_paginated_response(windows)
+        return Response(windows)
+
+    @action(detail=False, permission_classes=[IsAdminUser])
+    def occupancy(self, request):
+        date_from, date_to = self.get_date_range()
+        rooms = self.filter_queryset(self.get_queryset())
+        return Response(
+            OccupancyDaySerializer(
+                occupancy_report(rooms, date_from, date_to), many=True
+            ).data
+        )
 
 
 @extend_schema_view(
@@ -73,6 +385,31 @@ class RoomViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         tags=["Reservations"],
         description="Delete reservation by ID",
     ),
+    bulk_create=extend_schema(
+        tags=["Reservations"],
+        description="Create reservations for a batch of rooms and dates. "
+        "Every item is reported as created or rejected, with "
+        "all_or_nothing nothing is created if any item is rejected",
+        request=ReservationBulkCreateSerializer,
+        responses=ReservationBulkResponseSerializer,
+    ),
+    export=extend_schema(
+        tags=["Reservations"],
+        description="Stream reservations overlapping the optional period "
+        "as CSV or NDJSON (admin only)",
+        parameters=[
+            OpenApiParameter(
+                name="export_format", enum=list(EXPORT_FORMATS), default="csv"
+            ),
+            OpenApiParameter(name="start_date", type=datetime),
+            OpenApiParameter(name="end_date", type=datetime),
+            OpenApiParameter(name="room", type=int, many=True),
+        ],
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+        },
+    ),
 )
 class ReservationViewSet(
     mixins.CreateModelMixin,
@@ -81,44 +418,141 @@ class ReservationViewSet(
     viewsets.GenericViewSet,
 ):
     queryset = Reservation.objects.all()
+    # Only the id and role of the user are needed, both come from the token
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ("start_date", "id")
 
     def get_queryset(self):
-        if self.request.user.is_admin:
-            return Reservation.objects.all()
-        return Reservation.objects.filter(user=self.request.user)
+        queryset = Reservation.objects.select_related("room")
+        if has_admin_role(self.request.user):
+            return queryset
+        return queryset.filter(user_id=self.request.user.id)
 
     def get_serializer_class(self):
         if self.action == "create":
             return ReservationCreateSerializer
+        if self.action == "bulk_create":
+            return ReservationBulkCreateSerializer
         return ReservationRetrieveSerializer
 
     def perform_create(self, serializer):
         start_date = serializer.validated_data["start_date"]
         end_date = serializer.validated_data["end_date"]
-        room = serializer.validated_data["room"]
 
         if start_date >= end_date:
             raise serializers.ValidationError(
                 "Start date must be before end date."
             )
+        if end_date - start_date > timedelta(days=RESERVATION_MAX_DAYS):
+            raise serializers.ValidationError(
+                f"Reservation must not exceed {RESERVATION_MAX_DAYS} days."
+            )
+
+        # Overlaps are rejected by the exclusion constraint on insert. It
+        # only covers a single partition of a partitioned table, there the
+        # overlap is checked under a per-room lock instead
+        try:
+            with transaction.atomic():
+                if settings.RESERVATION_PARTITIONING:
+                    room = serializer.validated_data["room"]
+                    lock_rooms([room.id])
+                    if (
+                        Reservation.objects.overlapping(start_date, end_date)
+                        .filter(room=room)
+                        .exists()
+                    ):
+                        raise serializers.ValidationError(
+                            "Room is already reserved for the given dates."
+                        )
+                serializer.save(user_id=self.request.user.id)
+        except IntegrityError as error:
+            message = reservation_constraint_message(error)
+            if message is None:
+                raise
+            raise serializers.ValidationError(message)
+
+    def list(self, request, *args, **kwargs):
+        if not settings.CONDITIONAL_LISTS_ENABLED:
+            return self.get_list_response()
+        read_from_primary()
+        response = conditional_response(
+            request, get_reservations_etag(request), self.get_list_response
+        )
+        # The list depends on the user of the token
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+    def get_list_response(self):
+        # Rows are serialized from .values(), skipping model instances
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *ReservationValuesSerializer.values_fields
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                ReservationValuesSerializer(page).data
+            )
+        return Response(ReservationValuesSerializer(queryset).data)
 
-        overlapping = Reservation.objects.filter(
-            room=room,
-            start_date__lt=end_date,
-            end_date__gt=start_date,
-        ).exists()
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = create_reservations(
+            request.user,
+            serializer.validated_data["reservations"],
+            serializer.validated_data["all_or_nothing"],
+        )
+        created = sum(result["status"] == "created" for result in results)
+        return Response(
+            {"created": created, "results": results},
+            status=(
+                status.HTTP_201_CREATED
+                if created
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
 
-        if overlapping:
+    @action(detail=False, permission_classes=[IsAdmin])
+    def export(self, request):
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
             raise serializers.ValidationError(
-                "Room is already reserved for the given dates."
+                f"Export format must be one of {', '.join(EXPORT_FORMATS)}."
             )
+        period = {}
+        for name in ("start_date", "end_date"):
+            value = request.query_params.get(name)
+            period[name] = parse_datetime_param(value)
+            if value and period[name] is None:
+                raise serializers.ValidationError(f"Invalid {name}.")
+        try:
+            room_ids = [
+                int(room_id)
+                for room_id in request.query_params.getlist("room")
+            ]
+        except ValueError:
+            raise serializers.ValidationError("Invalid room.")
 
-        serializer.save(user=self.request.user)
+        queryset = filter_export(
+            self.get_queryset(), room_ids=room_ids, **period
+        )
+        lines, content_type = EXPORT_FORMATS[export_format]
+        return StreamingHttpResponse(
+            join_lines(lines(export_rows(queryset))),
+            content_type=content_type,
+            headers={
+                "Content-Disposition": "attachment; "
+                f'filename="reservations.{export_format}"'
+            },
+        )
 
     def destroy(self, request, *args, **kwargs):
         reservation = self.get_object()
-        if request.user.is_admin or reservation.user == request.user:
+        if reservation.user_id == request.user.id or has_admin_role(
+            request.user
+        ):
             reservation.delete()
             return Response(
                 {"message": "Reservation successfully deleted."},
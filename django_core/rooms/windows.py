@@ -0,0 +1,44 @@
+from itertools import groupby
+
+from django.conf import settings
+from rooms.availability import availability_index, first_free_window
+from rooms.models import Reservation
+
+
+def find_free_windows(room_ids, start_date, duration, latest_start):
+    """
+    Earliest period of duration free for every room that starts between
+    start_date and latest_start, with None dates if there is none
+    """
+    if settings.AVAILABILITY_INDEX_ENABLED:
+        starts = availability_index.free_windows(
+            room_ids, start_date, duration, latest_start
+        )
+    else:
+        reservations = (
+            Reservation.objects.overlapping(
+                start_date, latest_start + duration
+            )
+            .filter(room_id__in=room_ids)
+            .order_by("room_id", "start_date")
+            .values_list("room_id", "start_date", "end_date")
+        )
+        starts = dict.fromkeys(room_ids, start_date)
+        for room_id, intervals in groupby(
+            reservations, key=lambda row: row[0]
+        ):
+            starts[room_id] = first_free_window(
+                ((start, end) for _, start, end in intervals),
+                start_date,
+                duration,
+                latest_start,
+            )
+
+    return [
+        {
+            "room": room_id,
+            "start_date": starts[room_id],
+            "end_date": starts[room_id] and starts[room_id] + duration,
+        }
+        for room_id in room_ids
+    ]
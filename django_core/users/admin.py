@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django_core.pagination import EstimatedCountPaginator
 from users.models import User
 
 
@@ -56,9 +57,8 @@ class CustomUserAdmin(UserAdmin):
         "email",
         "date_joined",
     )
-    search_fields = (
-        "email",
-        "first_name",
-        "last_name",
-        "middle_name",
-    )
+    # Only the email is trigram indexed, an OR over the name columns
+    # would scan the whole table
+    search_fields = ("email",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
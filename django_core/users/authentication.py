@@ -0,0 +1,118 @@
+from asgiref.sync import sync_to_async
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from users.cache import get_cached_user
+from users.models import User
+from users.tokens import USER_CLAIMS
+
+
+class ClaimsUser(TokenUser):
+    """
+    User built from the claims of an access token, without a DB lookup
+    """
+
+    @cached_property
+    def role(self):
+        return self.token["role"]
+
+    @cached_property
+    def email(self):
+        return self.token["email"]
+
+    @cached_property
+    def first_name(self):
+        return self.token["first_name"]
+
+    @cached_property
+    def last_name(self):
+        return self.token["last_name"]
+
+    @cached_property
+    def date_joined(self):
+        return parse_datetime(self.token["date_joined"])
+
+    @property
+    def is_admin(self):
+        return self.role == User.Role.ADMIN
+
+    @property
+    def is_staff(self):
+        return self.is_admin
+
+    @property
+    def is_superuser(self):
+        return self.is_admin
+
+
+def get_active_user(user_id):
+    user = get_cached_user(user_id)
+    if user is None:
+        raise AuthenticationFailed("User not found", code="user_not_found")
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return user
+
+
+def has_admin_role(user):
+    """
+    Whether the user is an admin. Claims keep the role the user had when
+    the token was issued, so for users built from them it is checked
+    against the database, e.g. before privileged actions.
+    """
+    if isinstance(user, ClaimsUser) and user.is_admin:
+        return get_active_user(user.id).is_admin
+    return user.is_admin
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication reading users through the user cache
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        return get_active_user(user_id)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authentication from the token claims alone. Tokens issued without the
+    user claims fall back to the cached user lookup. The role in the
+    claims may be stale, check it with has_admin_role before privileged
+    actions.
+    """
+
+    def get_user(self, validated_token):
+        if all(claim in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        return CachedJWTAuthentication().get_user(validated_token)
+
+
+async def aauthenticate(request):
+    """
+    Async counterpart of StatelessJWTAuthentication.authenticate for plain
+    async views, returns the user or None if no token was passed
+    """
+    authentication = StatelessJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    validated_token = authentication.get_validated_token(raw_token)
+    if all(claim in validated_token for claim in USER_CLAIMS):
+        return ClaimsUser(validated_token)
+    return await sync_to_async(get_active_user)(
+        validated_token[jwt_settings.USER_ID_CLAIM]
+    )
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from users.models import User
+
+
+def get_user_cache_key(user_id):
+    return f"users:user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    User by id from the shared cache for USER_CACHE_TTL seconds, None if it
+    does not exist. Saving or deleting a user drops it from the cache for
+    every process once the transaction commits.
+    """
+    key = get_user_cache_key(user_id)
+    user = cache.get(key) if settings.USER_CACHE_TTL else None
+    if user is None:
+        user = User.objects.filter(id=user_id).first()
+        if user is not None and settings.USER_CACHE_TTL:
+            cache.set(key, user, settings.USER_CACHE_TTL)
+    return user
+
+
+def invalidate_cached_user(user_id):
+    key = get_user_cache_key(user_id)
+    cache.delete(key)
+    # Again after the commit, a request may cache the old row meanwhile
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+from users.models import User
+from users.serializers import UserImportSerializer
+
+
+def read_csv(file):
+    for number, row in enumerate(csv.DictReader(file), start=2):
+        yield number, {key: value for key, value in row.items() if value}
+
+
+def read_ndjson(file):
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV or NDJSON file (one object per line) with "
+        "email, password, first_name, last_name, middle_name, role and "
+        "date_joined. Passwords are hashed in a process pool, rows with "
+        "invalid data or an email that is already taken are rejected"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='File to import, "-" for stdin')
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Defaults to the file extension",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Password hashing processes",
+        )
+        parser.add_argument(
+            "--rejected",
+            help="Write rejected rows with the reason to this NDJSON file",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or (
+            "csv" if options["path"].endswith(".csv") else "ndjson"
+        )
+        read = read_csv if file_format == "csv" else read_ndjson
+
+        self.seen = set()
+        self.imported = self.rejected = 0
+        self.rejected_file = (
+            open(options["rejected"], "w") if options["rejected"] else None
+        )
+        self.started = time.perf_counter()
+        file = (
+            sys.stdin
+            if options["path"] == "-"
+            else open(options["path"], newline="", encoding="utf-8")
+        )
+        try:
+            with ProcessPoolExecutor(
+                options["workers"], initializer=django.setup
+            ) as executor:
+                rows = read(file)
+                while batch := list(islice(rows, options["batch_size"])):
+                    self.import_batch(batch, executor, options["workers"])
+                    self.report()
+        finally:
+            if file is not sys.stdin:
+                file.close()
+            if self.rejected_file:
+                self.rejected_file.close()
+
+        self.stdout.write(f"Done: {self.report()}")
+
+    def reject(self, number, email, reason):
+        self.rejected += 1
+        if self.rejected_file:
+            self.rejected_file.write(
+                json.dumps(
+                    {"line": number, "email": email, "reason": reason},
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+
+    def import_batch(self, batch, executor, workers):
+        valid = {}
+        for number, row in batch:
+            if row is None:
+                self.reject(number, None, "Malformed row")
+                continue
+            serializer = UserImportSerializer(data=row)
+            if not serializer.is_valid():
+                self.reject(number, row.get("email"), serializer.errors)
+                continue
+            data = serializer.validated_data
+            data["email"] = User.objects.normalize_email(data["email"])
+            if data["email"] in self.seen:
+                self.reject(number, data["email"], "Duplicate email in file")
+                continue
+            self.seen.add(data["email"])
+            valid[number] = data
+
+        valid = self.drop_existing(valid)
+        passwords = [
+            data.pop("password", None) or None for data in valid.values()
+        ]
+        hashes = executor.map(
+            make_password,
+            passwords,
+            chunksize=max(1, len(passwords) // (workers * 4)),
+        )
+        users = [
+            User(password=password, **data)
+            for data, password in zip(valid.values(), hashes)
+        ]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+        except IntegrityError:
+            # Some of the emails were registered in the meantime
+            available = self.drop_existing(valid)
+            users = [
+                user
+                for number, user in zip(valid, users)
+                if number in available
+            ]
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+        self.imported += len(users)
+
+    def drop_existing(self, valid):
+        """
+        Rows of the batch whose email is not taken yet, by line number
+        """
+        existing = set(
+            User.objects.filter(
+                email__in=[data["email"] for data in valid.values()]
+            ).values_list("email", flat=True)
+        )
+        result = {}
+        for number, data in valid.items():
+            if data["email"] not in existing:
+                result[number] = data
+            else:
+                self.reject(number, data["email"], "Email is already taken")
+        return result
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        line = (
+            f"{self.imported} imported, {self.rejected} rejected, "
+            f"{self.imported / max(elapsed, 1e-6):.1f} users/s"
+        )
+        self.stderr.write(line)
+        return line
@@ -0,0 +1,75 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_user_email_trgm_idx"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="user",
+            options={"verbose_name": "User", "verbose_name_plural": "Users"},
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="is_superuser",
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="date_joined",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                verbose_name="Registration date",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="email",
+            field=models.EmailField(
+                error_messages={
+                    "unique": "User with given email already exists"
+                },
+                max_length=254,
+                unique=True,
+                verbose_name="email address",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="first_name",
+            field=models.CharField(
+                blank=True, max_length=150, verbose_name="First name"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="last_name",
+            field=models.CharField(
+                blank=True, max_length=150, verbose_name="Last name"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="middle_name",
+            field=models.CharField(
+                blank=True,
+                max_length=150,
+                null=True,
+                verbose_name="Middle name",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="role",
+            field=models.CharField(
+                choices=[("CUSTOMER", "Customer"), ("ADMIN", "Admin")],
+                default="CUSTOMER",
+                verbose_name="Role",
+            ),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Cast, Upper
 from django.utils import timezone
 from users.constants import NAME_MAX_LENGTH
 from users.managers import UserManager
@@ -44,6 +46,17 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # Matches the UPPER(email::text) LIKE '%...%' of icontains,
+            # so admin searches don't scan the whole table
+            GinIndex(
+                OpClass(
+                    Upper(Cast("email", models.TextField())),
+                    name="gin_trgm_ops",
+                ),
+                name="user_email_trgm_idx",
+            ),
+        ]
 
     @property
     def is_admin(self):
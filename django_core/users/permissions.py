@@ -0,0 +1,16 @@
+from rest_framework.permissions import BasePermission
+from users.authentication import has_admin_role
+
+
+class IsAdmin(BasePermission):
+    """
+    IsAdminUser with the role of users built from token claims checked
+    against the database
+    """
+
+    def has_permission(self, request, view):
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and has_admin_role(request.user)
+        )
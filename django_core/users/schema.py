@@ -0,0 +1,9 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = "users.authentication.CachedJWTAuthentication"
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = "users.authentication.StatelessJWTAuthentication"
@@ -1,8 +1,13 @@
+from django_core.metrics import SerializerMetricsMixin
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
 from users.models import User
+from users.tokens import RefreshToken
 
 
-class UserCreateSerializer(serializers.ModelSerializer):
+class UserCreateSerializer(
+    SerializerMetricsMixin, serializers.ModelSerializer
+):
     password = serializers.CharField(write_only=True)
 
     class Meta:
@@ -20,7 +25,9 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)
 
 
-class UserRetrieveSerializer(serializers.ModelSerializer):
+class UserRetrieveSerializer(
+    SerializerMetricsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = User
         fields = [
@@ -31,3 +38,33 @@ class UserRetrieveSerializer(serializers.ModelSerializer):
             "role",
             "date_joined",
         ]
+
+
+class TokenObtainPairSerializer(
+    SerializerMetricsMixin, jwt_serializers.TokenObtainPairSerializer
+):
+    token_class = RefreshToken
+
+
+class TokenRefreshSerializer(
+    SerializerMetricsMixin, jwt_serializers.TokenRefreshSerializer
+):
+    token_class = RefreshToken
+
+
+class UserImportSerializer(serializers.ModelSerializer):
+    # Uniqueness is checked for a whole batch at once by import_users
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_blank=True)
+
+    class Meta:
+        model = User
+        fields = [
+            "email",
+            "first_name",
+            "last_name",
+            "middle_name",
+            "role",
+            "date_joined",
+            "password",
+        ]
@@ -0,0 +1,35 @@
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from users.cache import get_cached_user
+
+# Claims describing the user, enough to serve requests without loading it
+USER_CLAIMS = ("role", "email", "first_name", "last_name", "date_joined")
+
+
+def set_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token["date_joined"] = user.date_joined.isoformat()
+
+
+class RefreshToken(tokens.RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        set_user_claims(token, user)
+        token.user = user
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        # Refreshed access tokens pick up changes made since the login,
+        # e.g. a new role
+        user = getattr(self, "user", None) or get_cached_user(
+            self[jwt_settings.USER_ID_CLAIM]
+        )
+        if user is None or not user.is_active:
+            raise TokenError("User not found or inactive")
+        set_user_claims(access, user)
+        return access
@@ -2,6 +2,7 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from users.authentication import StatelessJWTAuthentication
 from users.models import User
 from users.serializers import UserCreateSerializer, UserRetrieveSerializer
 
@@ -26,6 +27,7 @@ class UserViewSet(
     """
 
     queryset = User.objects.all()
+    keyset_ordering = ("id",)
 
     def get_permissions(self):
         if self.action == "create":
@@ -45,6 +47,8 @@ class CurrentUserViewSet(viewsets.ViewSet):
     Get information about current user
     """
 
+    # Served from the token claims, without loading the user
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @extend_schema(